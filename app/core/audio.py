@@ -0,0 +1,158 @@
+"""
+오디오 도구(ffmpeg/ffprobe) 탐색.
+앱 시작 시 한 번만 ffmpeg 위치와 지원 코덱을 확인해 AudioCapabilities에 기록하고,
+STT 경로는 요청마다 서브프로세스를 띄우지 않고 이 정보를 참조합니다.
+"""
+
+import os
+import shutil
+import subprocess
+
+# PATH에 없을 때 확인할 ffmpeg 설치 경로 (Windows 개발 환경)
+FFMPEG_CANDIDATE_DIRS = [
+    'C:\\ffmpeg-7.1.1-essentials_build\\bin',  # 로컬 개발 환경
+    'C:\\ffmpeg\\bin',                         # 일반적인 설치 경로
+    'C:\\Program Files\\ffmpeg\\bin',          # Program Files 설치 경로
+    'C:\\Program Files (x86)\\ffmpeg\\bin',    # Program Files (x86) 설치 경로
+]
+
+# 확장자 → 디코딩에 필요한 ffmpeg 디코더 (하나라도 있으면 처리 가능)
+EXT_DECODERS = {
+    ".wav": ("pcm_s16le",),
+    ".mp3": ("mp3", "mp3float"),
+    ".m4a": ("aac",),
+    ".aac": ("aac",),
+    ".ogg": ("vorbis", "libvorbis", "opus", "libopus"),
+    ".webm": ("opus", "libopus", "vorbis", "libvorbis"),
+    ".flac": ("flac",),
+}
+
+# ffmpeg 없이 pydub만으로 읽을 수 있는 형식
+NATIVE_EXTS = {".wav"}
+
+_capabilities: "AudioCapabilities | None" = None
+
+
+class AudioCapabilities:
+    """오디오 도구 탐색 결과 (ffmpeg 경로, 버전, 지원 코덱)"""
+
+    def __init__(
+        self,
+        ffmpeg_path: str | None = None,
+        ffprobe_path: str | None = None,
+        version: str | None = None,
+        decoders: frozenset[str] = frozenset(),
+        encoders: frozenset[str] = frozenset(),
+    ):
+        self.ffmpeg_path = ffmpeg_path
+        self.ffprobe_path = ffprobe_path
+        self.version = version
+        self.decoders = decoders
+        self.encoders = encoders
+
+    @property
+    def ffmpeg_available(self) -> bool:
+        return self.ffmpeg_path is not None
+
+    def can_decode(self, ext: str) -> bool:
+        """해당 확장자 파일을 로컬에서 디코딩할 수 있는지 여부"""
+        ext = ext.lower()
+        if ext in NATIVE_EXTS:
+            return True
+        if not self.ffmpeg_available or not self.ffprobe_path:
+            return False
+        return any(decoder in self.decoders for decoder in EXT_DECODERS.get(ext, ()))
+
+    def can_encode(self, codec: str) -> bool:
+        return self.ffmpeg_available and codec in self.encoders
+
+    @property
+    def local_formats(self) -> list[str]:
+        return sorted(ext for ext in EXT_DECODERS if self.can_decode(ext))
+
+    def as_dict(self) -> dict:
+        return {
+            "ffmpeg_available": self.ffmpeg_available,
+            "ffmpeg_version": self.version,
+            "local_formats": self.local_formats,
+        }
+
+
+def _find_tool(name: str) -> str | None:
+    path = shutil.which(name)
+    if path:
+        return path
+    for directory in FFMPEG_CANDIDATE_DIRS:
+        candidate = os.path.join(directory, f"{name}.exe")
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _run_tool(path: str, *args: str) -> str:
+    result = subprocess.run([path, "-hide_banner", *args], capture_output=True, text=True, timeout=10)
+    return result.stdout if result.returncode == 0 else ""
+
+
+def _parse_codecs(listing: str) -> frozenset[str]:
+    """`ffmpeg -decoders`/`-encoders` 출력에서 코덱 이름 추출 (" A....D mp3  ..." 형식)"""
+    names = set()
+    for line in listing.splitlines():
+        parts = line.split()
+        if len(parts) >= 2 and len(parts[0]) == 6 and parts[0][0] in "VAS" and parts[1] != "=":
+            names.add(parts[1])
+    return frozenset(names)
+
+
+def probe_audio_toolchain() -> AudioCapabilities:
+    """ffmpeg/ffprobe 위치와 지원 코덱을 확인 (서브프로세스 실행)"""
+    ffmpeg_path = _find_tool("ffmpeg")
+    if ffmpeg_path is None:
+        return AudioCapabilities()
+
+    try:
+        version_lines = _run_tool(ffmpeg_path, "-version").splitlines()
+        return AudioCapabilities(
+            ffmpeg_path=ffmpeg_path,
+            ffprobe_path=_find_tool("ffprobe"),
+            version=version_lines[0] if version_lines else None,
+            decoders=_parse_codecs(_run_tool(ffmpeg_path, "-decoders")),
+            encoders=_parse_codecs(_run_tool(ffmpeg_path, "-encoders")),
+        )
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"경고: ffmpeg 실행 확인 실패: {e}")
+        return AudioCapabilities()
+
+
+def _configure_pydub(capabilities: AudioCapabilities) -> None:
+    """pydub이 탐색한 ffmpeg/ffprobe를 사용하도록 설정"""
+    if not capabilities.ffmpeg_available:
+        return
+    # ffprobe는 pydub이 PATH에서 찾으므로 PATH 밖 설치 경로는 한 번만 추가
+    tool_dir = os.path.dirname(capabilities.ffmpeg_path)
+    if tool_dir not in os.environ.get("PATH", "").split(os.pathsep):
+        os.environ["PATH"] = tool_dir + os.pathsep + os.environ.get("PATH", "")
+    try:
+        from pydub import AudioSegment
+        AudioSegment.converter = capabilities.ffmpeg_path
+    except ImportError:
+        pass
+
+
+def init_audio_toolchain() -> AudioCapabilities:
+    """오디오 도구 탐색 (앱 시작 시 호출)"""
+    global _capabilities
+    _capabilities = probe_audio_toolchain()
+    _configure_pydub(_capabilities)
+    if _capabilities.ffmpeg_available:
+        print(f"ffmpeg 확인 완료: {_capabilities.ffmpeg_path} (로컬 STT 형식: {', '.join(_capabilities.local_formats)})")
+    else:
+        print("경고: ffmpeg가 설치되지 않았습니다. 로컬 STT는 WAV 파일만 처리할 수 있습니다.")
+    return _capabilities
+
+
+def get_audio_capabilities() -> AudioCapabilities:
+    """오디오 도구 탐색 결과 반환 (앱 lifecycle 밖에서 호출되면 지연 탐색)"""
+    if _capabilities is None:
+        return init_audio_toolchain()
+    return _capabilities
@@ -0,0 +1,197 @@
+"""
+이 모듈은 외부 API 호출 결과를 재사용하기 위한 캐시를 제공합니다.
+- MemoryCache: 프로세스 메모리에 보관하는 TTL + LRU 캐시
+- SQLiteCache: seein.db의 cache_entries 테이블에 저장되어 서버 재시작 후에도 유지되는 TTL + LRU 캐시
+두 캐시 모두 get/set/stats와 비동기 코드용 aget/aset을 제공합니다.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, BinaryIO
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.database_models import CacheEntry
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def content_hash(data: bytes | BinaryIO) -> str:
+    """바이트 또는 바이너리 버퍼 내용의 SHA-256 해시(hex)를 계산"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(data).hexdigest()
+
+    digest = hashlib.sha256()
+    data.seek(0)
+    for chunk in iter(lambda: data.read(_HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    data.seek(0)
+    return digest.hexdigest()
+
+
+class _CacheStats:
+    """캐시 적중/미스 카운터"""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _record(self, hit: bool) -> None:
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self) -> dict:
+        """캐시 적중/미스 횟수와 적중률 반환"""
+        total = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class MemoryCache(_CacheStats):
+    """
+    프로세스 메모리 캐시. ttl_seconds가 지난 항목은 조회 시 만료 처리되고,
+    항목 수가 max_entries를 넘으면 가장 오래 조회되지 않은 항목부터 삭제합니다.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int, max_entries: int):
+        super().__init__(namespace)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and self.ttl_seconds > 0 and item[0] < time.monotonic() - self.ttl_seconds:
+                del self._entries[key]
+                item = None
+            if item is not None:
+                self._entries.move_to_end(key)
+        self._record(hit=item is not None)
+        return item[1] if item is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def aget(self, key: str) -> Any | None:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        self.set(key, value)
+
+
+class SQLiteCache(_CacheStats):
+    """
+    namespace 단위로 분리되는 영속 캐시.
+    ttl_seconds가 지난 항목은 조회 시 만료 처리되고,
+    항목 수가 max_entries를 넘으면 가장 오래 조회되지 않은 항목부터 삭제합니다.
+    DB I/O가 발생하므로 비동기 코드에서는 스레드풀에서 실행되는 aget/aset을 사용하세요.
+    """
+
+    def __init__(self, namespace: str, ttl_seconds: int, max_entries: int):
+        super().__init__(namespace)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> Any | None:
+        db = SessionLocal()
+        try:
+            entry = db.get(CacheEntry, (self.namespace, key))
+            if entry is None:
+                self._record(hit=False)
+                return None
+
+            now = datetime.utcnow()
+            if self.ttl_seconds > 0 and entry.created_at < now - timedelta(seconds=self.ttl_seconds):
+                db.delete(entry)
+                db.commit()
+                self._record(hit=False)
+                return None
+
+            entry.last_accessed_at = now
+            db.commit()
+            self._record(hit=True)
+            return json.loads(entry.value)
+        except Exception as e:
+            db.rollback()
+            print(f"[cache:{self.namespace}] 캐시 조회 오류: {type(e).__name__} (key={key[:16]})")
+            self._record(hit=False)
+            return None
+        finally:
+            db.close()
+
+    def set(self, key: str, value: Any) -> None:
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            # 같은 키를 동시에 저장해도(재시도, 일괄 요청 내 같은 이미지) UNIQUE 충돌이 나지 않도록 한 문장으로 upsert
+            statement = sqlite_insert(CacheEntry).values(
+                namespace=self.namespace,
+                key=key,
+                value=json.dumps(value, ensure_ascii=False),
+                created_at=now,
+                last_accessed_at=now,
+            )
+            statement = statement.on_conflict_do_update(
+                index_elements=[CacheEntry.namespace, CacheEntry.key],
+                set_={
+                    "value": statement.excluded.value,
+                    "created_at": statement.excluded.created_at,
+                    "last_accessed_at": statement.excluded.last_accessed_at,
+                },
+            )
+            db.execute(statement)
+            db.commit()
+
+            self._evict(db)
+        except Exception as e:
+            db.rollback()
+            # 예외 메시지에는 SQL 파라미터(캐시된 영수증 내용 등)가 포함될 수 있으므로 종류와 키만 기록
+            print(f"[cache:{self.namespace}] 캐시 저장 오류: {type(e).__name__} (key={key[:16]})")
+        finally:
+            db.close()
+
+    async def aget(self, key: str) -> Any | None:
+        return await run_in_threadpool(self.get, key)
+
+    async def aset(self, key: str, value: Any) -> None:
+        await run_in_threadpool(self.set, key, value)
+
+    def _evict(self, db) -> None:
+        """만료된 항목과 max_entries를 초과한 LRU 항목 삭제"""
+        query = db.query(CacheEntry).filter(CacheEntry.namespace == self.namespace)
+
+        if self.ttl_seconds > 0:
+            expire_before = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+            query.filter(CacheEntry.created_at < expire_before).delete(synchronize_session=False)
+
+        overflow = query.count() - self.max_entries
+        if overflow > 0:
+            stale_keys = [
+                key for (key,) in query.with_entities(CacheEntry.key)
+                .order_by(CacheEntry.last_accessed_at.asc())
+                .limit(overflow)
+            ]
+            query.filter(CacheEntry.key.in_(stale_keys)).delete(synchronize_session=False)
+
+        db.commit()
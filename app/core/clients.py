@@ -0,0 +1,111 @@
+"""
+이 모듈은 애플리케이션 전체에서 공유하는 외부 API 클라이언트를 관리합니다.
+클라이언트는 앱 시작 시 한 번 생성되고 종료 시 닫히며, 요청마다 새 커넥션을 맺지 않도록 커넥션 풀을 재사용합니다.
+"""
+
+import httpx
+import openai
+
+from app.core.config import (
+    OPENAI_API_KEY,
+    OPENAI_MAX_CONNECTIONS,
+    OPENAI_MAX_KEEPALIVE,
+    OPENAI_TIMEOUT,
+    OPENAI_MAX_RETRIES,
+    CLOVA_OCR_MAX_CONNECTIONS,
+    CLOVA_OCR_MAX_KEEPALIVE,
+    CLOVA_OCR_KEEPALIVE_EXPIRY,
+    CLOVA_OCR_CONNECT_TIMEOUT,
+    CLOVA_OCR_TIMEOUT,
+    CLOVA_OCR_HTTP2,
+)
+
+try:
+    import h2  # type: ignore  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_ocr_client: httpx.AsyncClient | None = None
+_async_openai_client: openai.AsyncOpenAI | None = None
+
+
+def _create_ocr_client() -> httpx.AsyncClient:
+    http2 = CLOVA_OCR_HTTP2 and HTTP2_AVAILABLE
+    if CLOVA_OCR_HTTP2 and not HTTP2_AVAILABLE:
+        print("경고: h2 패키지가 설치되지 않아 클로바 OCR 클라이언트를 HTTP/1.1로 생성합니다.")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=CLOVA_OCR_MAX_CONNECTIONS,
+            max_keepalive_connections=CLOVA_OCR_MAX_KEEPALIVE,
+            keepalive_expiry=CLOVA_OCR_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(CLOVA_OCR_TIMEOUT, connect=CLOVA_OCR_CONNECT_TIMEOUT),
+    )
+
+
+def init_ocr_client() -> httpx.AsyncClient:
+    """클로바 OCR 공용 클라이언트 생성 (앱 시작 시 호출)"""
+    global _ocr_client
+    if _ocr_client is None or _ocr_client.is_closed:
+        _ocr_client = _create_ocr_client()
+        print(f"클로바 OCR 클라이언트 생성 완료 (HTTP/2: {CLOVA_OCR_HTTP2 and HTTP2_AVAILABLE}, 최대 커넥션: {CLOVA_OCR_MAX_CONNECTIONS})")
+    return _ocr_client
+
+
+def get_ocr_client() -> httpx.AsyncClient:
+    """클로바 OCR 공용 클라이언트 반환 (앱 lifecycle 밖에서 호출되면 지연 생성)"""
+    if _ocr_client is None or _ocr_client.is_closed:
+        return init_ocr_client()
+    return _ocr_client
+
+
+async def close_ocr_client() -> None:
+    """클로바 OCR 공용 클라이언트 종료 (앱 종료 시 호출)"""
+    global _ocr_client
+    if _ocr_client is not None:
+        await _ocr_client.aclose()
+        _ocr_client = None
+        print("클로바 OCR 클라이언트 종료 완료")
+
+
+def _openai_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+    )
+
+
+def init_openai_clients() -> None:
+    """OpenAI 공용 비동기 클라이언트 생성 (앱 시작 시 호출)"""
+    global _async_openai_client
+    if not OPENAI_API_KEY:
+        print("Warning: OPENAI_API_KEY가 설정되지 않았습니다. OpenAI 클라이언트를 생성하지 않습니다.")
+        return
+
+    if _async_openai_client is None:
+        _async_openai_client = openai.AsyncOpenAI(
+            api_key=OPENAI_API_KEY,
+            timeout=OPENAI_TIMEOUT,
+            max_retries=OPENAI_MAX_RETRIES,
+            http_client=openai.DefaultAsyncHttpxClient(limits=_openai_limits()),
+        )
+    print(f"OpenAI 클라이언트 생성 완료 (최대 커넥션: {OPENAI_MAX_CONNECTIONS})")
+
+
+def get_async_openai_client() -> openai.AsyncOpenAI | None:
+    """OpenAI 공용 비동기 클라이언트 반환 (API 키가 없으면 None)"""
+    if _async_openai_client is None:
+        init_openai_clients()
+    return _async_openai_client
+
+
+async def close_openai_clients() -> None:
+    """OpenAI 공용 클라이언트 종료 (앱 종료 시 호출)"""
+    global _async_openai_client
+    if _async_openai_client is not None:
+        await _async_openai_client.close()
+        _async_openai_client = None
+    print("OpenAI 클라이언트 종료 완료")
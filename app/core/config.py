@@ -10,3 +10,104 @@ from dotenv import load_dotenv
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# 클로바 OCR 공용 HTTP 클라이언트 설정 (커넥션 풀 / 타임아웃)
+CLOVA_OCR_MAX_CONNECTIONS = int(os.getenv("CLOVA_OCR_MAX_CONNECTIONS", "20"))
+CLOVA_OCR_MAX_KEEPALIVE = int(os.getenv("CLOVA_OCR_MAX_KEEPALIVE", "10"))
+CLOVA_OCR_KEEPALIVE_EXPIRY = float(os.getenv("CLOVA_OCR_KEEPALIVE_EXPIRY", "60"))
+CLOVA_OCR_CONNECT_TIMEOUT = float(os.getenv("CLOVA_OCR_CONNECT_TIMEOUT", "5"))
+CLOVA_OCR_TIMEOUT = float(os.getenv("CLOVA_OCR_TIMEOUT", "30"))
+CLOVA_OCR_HTTP2 = os.getenv("CLOVA_OCR_HTTP2", "true").lower() == "true"
+
+# OpenAI 공용 클라이언트 설정 (커넥션 풀 / 타임아웃 / 재시도)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+
+# 영수증 분석 결과 캐시 설정 (이미지 해시 기준, seein.db에 저장)
+RECEIPT_CACHE_TTL_SECONDS = int(os.getenv("RECEIPT_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+RECEIPT_CACHE_MAX_ENTRIES = int(os.getenv("RECEIPT_CACHE_MAX_ENTRIES", "10000"))
+RECEIPT_TEXT_CACHE_MIN_CHARS = int(os.getenv("RECEIPT_TEXT_CACHE_MIN_CHARS", "20"))  # 정규화된 OCR 텍스트가 이보다 짧으면 텍스트 캐시를 사용하지 않음
+
+# 영수증 업로드 설정
+# RECEIPT_SPOOL_MAX_SIZE까지는 메모리에 보관하고, 그보다 큰 이미지만 디스크 임시 파일로 넘깁니다. (영수증 라우트에만 적용)
+RECEIPT_SPOOL_MAX_SIZE = int(os.getenv("RECEIPT_SPOOL_MAX_SIZE", str(16 * 1024 * 1024)))
+# 이미지 1장 최대 크기 - 일반적인 휴대폰 사진(4~12MB)보다 충분히 크게 두고, 본문을 읽는 도중 초과하면 즉시 413 응답
+RECEIPT_MAX_IMAGE_BYTES = int(os.getenv("RECEIPT_MAX_IMAGE_BYTES", str(50 * 1024 * 1024)))
+
+# 영수증 일괄 분석 설정
+RECEIPT_BATCH_MAX_FILES = int(os.getenv("RECEIPT_BATCH_MAX_FILES", "50"))
+RECEIPT_BATCH_MAX_TOTAL_BYTES = int(os.getenv("RECEIPT_BATCH_MAX_TOTAL_BYTES", str(200 * 1024 * 1024)))  # 요청 전체 최대 크기 (본문을 읽는 도중 초과하면 즉시 413 응답)
+RECEIPT_BATCH_CONCURRENCY = int(os.getenv("RECEIPT_BATCH_CONCURRENCY", "8"))
+
+# 클로바 OCR 요청 1건에 묶어 보낼 최대 이미지 수 (현재 CLOVA General OCR은 요청당 1장만 허용)
+CLOVA_OCR_MAX_IMAGES_PER_REQUEST = int(os.getenv("CLOVA_OCR_MAX_IMAGES_PER_REQUEST", "1"))
+
+# 영수증 OCR 전처리 설정 (EXIF 회전 보정 → 축소 → 흑백 변환 → JPEG 재인코딩)
+RECEIPT_PREPROCESS_ENABLED = os.getenv("RECEIPT_PREPROCESS_ENABLED", "true").lower() == "true"
+RECEIPT_OCR_MAX_LONG_EDGE = int(os.getenv("RECEIPT_OCR_MAX_LONG_EDGE", "2000"))
+RECEIPT_OCR_GRAYSCALE = os.getenv("RECEIPT_OCR_GRAYSCALE", "true").lower() == "true"
+RECEIPT_OCR_JPEG_QUALITY = int(os.getenv("RECEIPT_OCR_JPEG_QUALITY", "85"))
+
+# 이미지 처리(디코딩/리사이즈/인코딩) 전용 워커 풀 설정
+IMAGE_POOL_KIND = os.getenv("IMAGE_POOL_KIND", "process").lower()  # process | thread
+IMAGE_POOL_WORKERS = int(os.getenv("IMAGE_POOL_WORKERS", str(os.cpu_count() or 2)))
+
+# GPT Vision 전송 이미지 설정 (모델이 실제로 사용하는 해상도까지만 축소 + detail 자동 선택)
+VISION_DETAIL = os.getenv("VISION_DETAIL", "auto").lower()  # auto | low | high
+VISION_MAX_LONG_EDGE = int(os.getenv("VISION_MAX_LONG_EDGE", "2048"))
+VISION_MAX_SHORT_EDGE = int(os.getenv("VISION_MAX_SHORT_EDGE", "768"))
+VISION_LOW_DETAIL_EDGE = int(os.getenv("VISION_LOW_DETAIL_EDGE", "512"))
+VISION_TEXT_DENSITY_THRESHOLD = float(os.getenv("VISION_TEXT_DENSITY_THRESHOLD", "0.05"))
+VISION_JPEG_QUALITY = int(os.getenv("VISION_JPEG_QUALITY", "85"))
+
+# 상품 추천 결과 캐시 설정 (상품명/브랜드/요약 기준)
+RECOMMENDATION_CACHE_TTL_SECONDS = int(os.getenv("RECOMMENDATION_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+RECOMMENDATION_CACHE_MAX_ENTRIES = int(os.getenv("RECOMMENDATION_CACHE_MAX_ENTRIES", "5000"))
+RECOMMENDATION_CACHE_PERSIST = os.getenv("RECOMMENDATION_CACHE_PERSIST", "false").lower() == "true"
+
+# 상품 이미지 지각 해시(dHash) 중복 판별 설정
+PRODUCT_PHASH_ENABLED = os.getenv("PRODUCT_PHASH_ENABLED", "true").lower() == "true"
+PRODUCT_PHASH_MAX_DISTANCE = int(os.getenv("PRODUCT_PHASH_MAX_DISTANCE", "6"))
+PRODUCT_PHASH_MAX_ENTRIES = int(os.getenv("PRODUCT_PHASH_MAX_ENTRIES", "1000000"))
+
+# 상품 분석+추천 기본 모드 (two_step: Vision 추출 후 추천 호출 / single: Vision 호출 한 번에 추출과 추천)
+PRODUCT_ANALYZE_MODE = os.getenv("PRODUCT_ANALYZE_MODE", "two_step").lower()
+
+# 상품 정보 JSON이 스키마에 맞지 않을 때 텍스트만으로 고치는 저렴한 모델
+PRODUCT_JSON_REPAIR_MODEL = os.getenv("PRODUCT_JSON_REPAIR_MODEL", "gpt-4o-mini")
+
+# Whisper 업로드 전 오디오 정규화 설정 (16kHz 모노로 다운믹스 후 mp3/opus로 재인코딩, ffmpeg 필요)
+STT_NORMALIZE_ENABLED = os.getenv("STT_NORMALIZE_ENABLED", "true").lower() == "true"
+STT_NORMALIZE_FORMAT = os.getenv("STT_NORMALIZE_FORMAT", "mp3").lower()  # mp3 | opus
+STT_NORMALIZE_SAMPLE_RATE = int(os.getenv("STT_NORMALIZE_SAMPLE_RATE", "16000"))
+STT_NORMALIZE_BITRATE = os.getenv("STT_NORMALIZE_BITRATE", "32k")
+STT_NORMALIZE_MIN_BYTES = int(os.getenv("STT_NORMALIZE_MIN_BYTES", str(256 * 1024)))  # 이보다 작은 파일은 그대로 전송
+
+# 오디오 변환(ffmpeg 서브프로세스) 동시 실행 수
+AUDIO_POOL_WORKERS = int(os.getenv("AUDIO_POOL_WORKERS", str(os.cpu_count() or 2)))
+
+# 긴 오디오 분할 전사 설정 (무음 구간 제거 → 약 STT_CHUNK_TARGET_SECONDS초 단위로 나눠 동시에 전사)
+STT_CHUNKING_ENABLED = os.getenv("STT_CHUNKING_ENABLED", "true").lower() == "true"
+STT_CHUNK_TARGET_SECONDS = int(os.getenv("STT_CHUNK_TARGET_SECONDS", "30"))
+STT_CHUNK_OVERLAP_MS = int(os.getenv("STT_CHUNK_OVERLAP_MS", "1000"))  # 말하는 도중 잘라야 할 때 겹치는 길이
+STT_CHUNK_CONCURRENCY = int(os.getenv("STT_CHUNK_CONCURRENCY", "4"))
+STT_SILENCE_MIN_MS = int(os.getenv("STT_SILENCE_MIN_MS", "700"))
+STT_SILENCE_OFFSET_DB = float(os.getenv("STT_SILENCE_OFFSET_DB", "16"))  # 평균 음량보다 이만큼 작으면 무음
+STT_SILENCE_KEEP_MS = int(os.getenv("STT_SILENCE_KEEP_MS", "200"))  # 음성 구간 앞뒤로 남길 여유
+
+# STT 업로드 최대 크기 (본문을 읽는 도중 초과하면 즉시 413 응답)
+STT_MAX_UPLOAD_BYTES = int(os.getenv("STT_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+
+# STT 전사 결과 캐시 설정 (디코딩한 오디오 PCM 해시 기준)
+STT_CACHE_ENABLED = os.getenv("STT_CACHE_ENABLED", "true").lower() == "true"
+STT_CACHE_TTL_SECONDS = int(os.getenv("STT_CACHE_TTL_SECONDS", str(7 * 24 * 60 * 60)))
+STT_CACHE_MAX_ENTRIES = int(os.getenv("STT_CACHE_MAX_ENTRIES", "5000"))
+STT_CACHE_PERSIST = os.getenv("STT_CACHE_PERSIST", "false").lower() == "true"
+WHISPER_COST_PER_MINUTE = float(os.getenv("WHISPER_COST_PER_MINUTE", "0.006"))  # 절감액 추정용 (USD)
+
+# 로컬 STT 엔진 (Whisper 실패/할당량 초과 시 fallback 순서, 쉼표 구분: vosk | google)
+# vosk는 오프라인 엔진으로 한국어 모델(예: vosk-model-small-ko-0.22) 경로를 STT_VOSK_MODEL_PATH에 지정해야 사용됨 (DEPLOYMENT.md 참고)
+STT_LOCAL_BACKENDS = [name.strip().lower() for name in os.getenv("STT_LOCAL_BACKENDS", "vosk,google").split(",") if name.strip()]
+STT_VOSK_MODEL_PATH = os.getenv("STT_VOSK_MODEL_PATH", "")
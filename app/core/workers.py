@@ -0,0 +1,108 @@
+"""
+이 모듈은 CPU를 많이 쓰는 작업을 이벤트 루프 밖에서 실행하기 위한 워커 풀을 관리합니다.
+풀은 앱 시작 시 생성되고 종료 시 정리되며, 비동기 코드에서는 run_in_image_pool / run_in_audio_pool로 결과를 await 합니다.
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Callable
+
+from app.core.config import IMAGE_POOL_KIND, IMAGE_POOL_WORKERS, AUDIO_POOL_WORKERS
+
+_image_pool: Executor | None = None
+_audio_pool: ThreadPoolExecutor | None = None
+
+
+def init_image_pool() -> Executor:
+    """이미지 처리 워커 풀 생성 (앱 시작 시 호출)"""
+    global _image_pool
+    if _image_pool is None:
+        workers = max(1, IMAGE_POOL_WORKERS)
+        if IMAGE_POOL_KIND == "thread":
+            _image_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-worker")
+        else:
+            # fork는 실행 중인 스레드/이벤트 루프 상태까지 복제하므로 spawn으로 워커를 띄움
+            _image_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        print(f"이미지 워커 풀 생성 완료 ({IMAGE_POOL_KIND}, 워커 {workers}개)")
+    return _image_pool
+
+
+def get_image_pool() -> Executor:
+    """이미지 처리 워커 풀 반환 (앱 lifecycle 밖에서 호출되면 지연 생성)"""
+    return _image_pool or init_image_pool()
+
+
+def shutdown_image_pool() -> None:
+    """이미지 처리 워커 풀 종료 (앱 종료 시 호출)"""
+    global _image_pool
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=True, cancel_futures=True)
+        _image_pool = None
+        print("이미지 워커 풀 종료 완료")
+
+
+def _replace_broken_image_pool(broken: Executor) -> None:
+    """워커 프로세스가 죽어 깨진 풀을 버리고 새 풀을 생성 (동시에 실패한 요청들은 한 번만 교체)"""
+    global _image_pool
+    if _image_pool is broken:
+        _image_pool = None
+        broken.shutdown(wait=False, cancel_futures=True)
+        print("경고: 이미지 워커 프로세스가 비정상 종료되어 워커 풀을 다시 생성합니다.")
+        init_image_pool()
+
+
+async def run_in_image_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    이미지 처리 함수를 워커 풀에서 실행하고 결과를 await (프로세스 풀이면 func는 모듈 최상위 함수여야 함)
+    워커 프로세스가 죽어(OOM, 디코더 크래시 등) 풀이 깨지면 풀을 새로 만들고 한 번만 다시 시도하며,
+    다시 실패하면 이 요청만 BrokenProcessPool로 실패합니다.
+    """
+    loop = asyncio.get_running_loop()
+    call = partial(func, *args, **kwargs)
+    pool = get_image_pool()
+    try:
+        return await loop.run_in_executor(pool, call)
+    except BrokenProcessPool:
+        _replace_broken_image_pool(pool)
+
+    pool = get_image_pool()
+    try:
+        return await loop.run_in_executor(pool, call)
+    except BrokenProcessPool:
+        # 같은 입력이 워커를 또 죽였으므로 재시도하지 않고, 다음 요청을 위해 풀만 교체
+        _replace_broken_image_pool(pool)
+        raise
+
+
+def init_audio_pool() -> ThreadPoolExecutor:
+    """오디오 변환 워커 풀 생성 (앱 시작 시 호출)"""
+    global _audio_pool
+    if _audio_pool is None:
+        # 실제 변환은 ffmpeg 서브프로세스가 하므로 스레드 풀로 동시 실행 수만 제한
+        workers = max(1, AUDIO_POOL_WORKERS)
+        _audio_pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="audio-worker")
+        print(f"오디오 워커 풀 생성 완료 (워커 {workers}개)")
+    return _audio_pool
+
+
+def get_audio_pool() -> ThreadPoolExecutor:
+    """오디오 변환 워커 풀 반환 (앱 lifecycle 밖에서 호출되면 지연 생성)"""
+    return _audio_pool or init_audio_pool()
+
+
+def shutdown_audio_pool() -> None:
+    """오디오 변환 워커 풀 종료 (앱 종료 시 호출)"""
+    global _audio_pool
+    if _audio_pool is not None:
+        _audio_pool.shutdown(wait=True, cancel_futures=True)
+        _audio_pool = None
+        print("오디오 워커 풀 종료 완료")
+
+
+async def run_in_audio_pool(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """오디오 변환 함수를 워커 풀에서 실행하고 결과를 await"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_audio_pool(), partial(func, *args, **kwargs))
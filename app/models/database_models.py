@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Index
 from sqlalchemy.sql import func
+from datetime import datetime
 from app.core.database import Base
 
 class User(Base):
@@ -14,4 +15,41 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     def __repr__(self):
-        return f"<User(id={self.id}, email='{self.email}', username='{self.username}')>" 
\ No newline at end of file
+        return f"<User(id={self.id}, email='{self.email}', username='{self.username}')>"
+
+
+class ProductCatalog(Base):
+    __tablename__ = "product_catalog"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # 조회 키: 정규화된 상품명/브랜드 (유니코드 통일, 대소문자 무시, 공백 축약)
+    normalized_name = Column(String, nullable=False)
+    normalized_brand = Column(String, nullable=False)
+    name = Column(String, nullable=False)
+    brand = Column(String, nullable=False)
+    summary = Column(Text, nullable=True)
+    recommendation = Column(Text, nullable=True)
+    seen_count = Column(Integer, nullable=False, default=1)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_product_catalog_name_brand", "normalized_name", "normalized_brand", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<ProductCatalog(id={self.id}, name='{self.name}', brand='{self.brand}')>"
+
+
+class CacheEntry(Base):
+    __tablename__ = "cache_entries"
+
+    # namespace로 캐시 종류(영수증 이미지 결과 등)를 구분
+    namespace = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    value = Column(Text, nullable=False)  # JSON 직렬화된 값
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<CacheEntry(namespace='{self.namespace}', key='{self.key}')>"
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class VisionProduct(BaseModel):
+    """GPT Vision이 이미지에서 추출한 상품 정보 (JSON 키는 한국어 별칭)"""
+    model_config = ConfigDict(populate_by_name=True)
+
+    name: str = Field(alias="상품명")
+    brand: str = Field(alias="브랜드")
+    summary: str = Field("", alias="요약")
+
+
+class VisionProductRecommendation(VisionProduct):
+    """단일 호출(single) 모드 응답: 상품 정보 + 구매 추천"""
+    recommendation: str = Field("", alias="추천")
@@ -1,11 +1,23 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+import json
+from typing import Literal
+
+from fastapi import APIRouter, UploadFile, File, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from app.services.product_analysis_service import analyze_product_image
-from app.services.product_recommendation_service import generate_product_recommendation
+from app.services.product_recommendation_service import get_product_recommendation, stream_product_recommendation
 from pydantic import BaseModel
-from app.services.product_combined_service import analyze_and_recommend
+from app.services.product_combined_service import analyze_and_recommend, stream_analyze_and_recommend
 
 router = APIRouter()
 
+# 프록시(nginx 등)가 이벤트를 모아 두지 않도록 버퍼링 비활성화
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, data: dict) -> str:
+    """Server-Sent Events 형식의 이벤트 한 건"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 
 @router.post("/analyze-product/")
 async def analyze_product(file: UploadFile = File(...)):
@@ -30,7 +42,7 @@ async def recommend_product(product: ProductInfo):
     try:
         print(f"[RECOMMEND] 입력 상품 - 이름: {product.name}, 브랜드: {product.brand}, 요약: {product.summary}")
 
-        result = generate_product_recommendation(
+        result = await get_product_recommendation(
             name=product.name,
             brand=product.brand,
             flavor=product.summary
@@ -45,6 +57,39 @@ async def recommend_product(product: ProductInfo):
         print(f"[RECOMMEND ERROR] {e}")
         return {"success": False, "error": str(e)}
 
+
+@router.post("/recommend-product/stream")
+async def recommend_product_stream(product: ProductInfo):
+    """
+    /recommend-product/의 SSE 스트리밍 버전.
+    "추천:" 판정 줄부터 delta 이벤트로 토큰을 전달하고, 마지막에 done 이벤트로 전체 추천을 보냅니다.
+    """
+    print(f"[RECOMMEND STREAM] 입력 상품 - 이름: {product.name}, 브랜드: {product.brand}, 요약: {product.summary}")
+
+    async def events():
+        yield ": stream start\n\n"  # 첫 바이트를 바로 보내 연결을 엶
+        try:
+            parts = []
+            async for text in stream_product_recommendation(
+                name=product.name,
+                brand=product.brand,
+                flavor=product.summary
+            ):
+                parts.append(text)
+                yield _sse("delta", {"text": text})
+
+            result = "".join(parts).strip()
+            if result:
+                yield _sse("done", {"success": True, "result": result})
+            else:
+                yield _sse("error", {"success": False, "error": "추천 응답이 비어 있습니다."})
+
+        except Exception as e:
+            print(f"[RECOMMEND ERROR] {e}")
+            yield _sse("error", {"success": False, "error": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 #
 # @router.post("/recommend-product/")
 # def recommend_product(product: ProductInfo):
@@ -61,6 +106,28 @@ async def recommend_product(product: ProductInfo):
 
 
 @router.post("/analyze-and-recommend-product/")
-async def analyze_and_recommend_product(file: UploadFile = File(...)):
-    result = await analyze_and_recommend(file)
-    return result
\ No newline at end of file
+async def analyze_and_recommend_product(
+    file: UploadFile = File(...),
+    mode: Literal["two_step", "single"] | None = Query(
+        None, description="two_step: 추출 후 추천 2회 호출 / single: 1회 호출 (기본값: PRODUCT_ANALYZE_MODE)"
+    ),
+):
+    result = await analyze_and_recommend(file, mode=mode)
+    return result
+
+
+@router.post("/analyze-and-recommend-product/stream")
+async def analyze_and_recommend_product_stream(file: UploadFile = File(...)):
+    """
+    /analyze-and-recommend-product/의 SSE 스트리밍 버전 (two_step 방식).
+    product 이벤트(상품 정보) → delta 이벤트(추천 토큰) → done 이벤트 순서로 전달합니다.
+    """
+    # 업로드 파일은 응답 본문 전송 전에 닫히므로 미리 읽어 둠
+    image_bytes = await file.read()
+
+    async def events():
+        yield ": stream start\n\n"
+        async for event, data in stream_analyze_and_recommend(image_bytes):
+            yield _sse(event, data)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers=SSE_HEADERS)
@@ -10,7 +10,6 @@ load_dotenv()
 
 CLOVA_OCR_URL = os.getenv("CLOVA_OCR_URL")
 CLOVA_OCR_SECRET = os.getenv("CLOVA_OCR_SECRET")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 @router.post("/analyze-receipt/")
 async def test_analyze_receipt(image: UploadFile = File(...)):
@@ -26,7 +25,7 @@ async def test_analyze_receipt(image: UploadFile = File(...)):
     
     extracted_text = extract_text(clova_res)
 
-    result = await analyze_receipt(extracted_text, OPENAI_API_KEY)
+    result = await analyze_receipt(extracted_text)
     if result == None:
         print("OPEN AI 텍스트 분석 에러 발생으로 진행 불가")
         return
@@ -1,40 +1,84 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
+from app.core.audio import get_audio_capabilities
+from app.core.config import STT_MAX_UPLOAD_BYTES
+from app.services.stt_backends import get_stt_backends
+from app.services.stt_cache import stt_cache_stats
 from app.services.stt_service import transcribe_audio, ALLOWED_EXTS
+from app.utils.upload_utils import (
+    MULTIPART_OVERHEAD_BYTES,
+    InvalidUploadError,
+    UploadTooLargeError,
+    read_multipart_file,
+)
 import os
 
 router = APIRouter(prefix="/stt", tags=["음성 인식"])
 
-@router.post("/transcribe")
-async def transcribe_speech(
-    file: UploadFile = File(...)
-):
-    """음성 파일을 텍스트로 변환 (공개 엔드포인트)"""
-    
-    # 파일 확장자 검증
-    file_ext = os.path.splitext(file.filename)[1].lower()
+MAX_FILE_SIZE_LABEL = f"{STT_MAX_UPLOAD_BYTES // (1024 * 1024)}MB"
+
+# 본문을 직접 읽으므로 문서(OpenAPI)에 multipart 파일 필드를 명시
+TRANSCRIBE_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            }
+        },
+    }
+}
+
+
+def _validate_audio_filename(filename: str) -> None:
+    # 파일 확장자 검증 (파일 본문을 받기 전에 확인)
+    file_ext = os.path.splitext(filename)[1].lower()
     if file_ext not in ALLOWED_EXTS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"지원하지 않는 파일 형식입니다. 지원 형식: {', '.join(ALLOWED_EXTS)}"
         )
-    
-    # 파일 크기 검증 (10MB 제한)
-    if file.size and file.size > 10 * 1024 * 1024:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="파일 크기는 10MB를 초과할 수 없습니다."
+
+
+@router.post("/transcribe", openapi_extra=TRANSCRIBE_REQUEST_BODY)
+async def transcribe_speech(request: Request):
+    """
+    음성 파일을 텍스트로 변환 (공개 엔드포인트)
+    요청 본문을 조각 단위로 읽으며 크기 제한을 확인하므로, 제한을 넘는 업로드는 끝까지 받지 않고 바로 거절합니다.
+    """
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"파일 크기는 {MAX_FILE_SIZE_LABEL}를 초과할 수 없습니다."
+    )
+
+    # Content-Length가 있으면 본문을 읽기 전에 거절
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > STT_MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES:
+        raise too_large
+
+    try:
+        filename, file_content = await read_multipart_file(
+            request.headers.get("content-type", ""),
+            request.stream(),
+            field_name="file",
+            max_bytes=STT_MAX_UPLOAD_BYTES,
+            validate_filename=_validate_audio_filename,
         )
-    
+    except UploadTooLargeError:
+        raise too_large
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
     try:
-        # 파일 내용 읽기
-        file_content = await file.read()
-        
         # STT 서비스 호출
-        transcription = transcribe_audio(file_content, file.filename)
+        transcription = await transcribe_audio(file_content, filename)
         
         return {
             "transcription": transcription,
-            "filename": file.filename
+            "filename": filename
         }
         
     except Exception as e:
@@ -48,5 +92,15 @@ async def get_supported_formats():
     """지원되는 오디오 파일 형식 조회"""
     return {
         "supported_formats": list(ALLOWED_EXTS),
-        "max_file_size": "10MB"
-    } 
\ No newline at end of file
+        "max_file_size": MAX_FILE_SIZE_LABEL,
+        "local_stt": {
+            **get_audio_capabilities().as_dict(),
+            "backends": [backend.name for backend in get_stt_backends()]
+        }
+    } 
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """전사 캐시 적중/미스 통계와 생략한 Whisper 사용량(추정 비용)"""
+    return stt_cache_stats()
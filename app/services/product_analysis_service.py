@@ -1,30 +1,33 @@
 import openai
 from fastapi import UploadFile
-import io
-import os
-import base64
-from PIL import Image
-from dotenv import load_dotenv
 
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+from app.core.clients import get_async_openai_client
+from app.core.workers import run_in_image_pool
+from app.models.product_model import VisionProduct
+from app.services.product_json_service import json_schema_response_format, validate_product_json
+from app.services.product_image_index import find_vision_result, remember_vision_result
+from app.utils.image_utils import prepare_vision_image, log_vision_image_stats
+
+async def analyze_product_image(file: UploadFile, client: openai.AsyncOpenAI | None = None) -> dict:
+    client = client or get_async_openai_client()
+    if client is None:
+        return {"success": False, "error": "OpenAI 클라이언트를 사용할 수 없습니다. OPENAI_API_KEY를 확인하세요."}
 
-async def analyze_product_image(file: UploadFile) -> dict:
     try:
         # 이미지 바이트 읽기
         image_bytes = await file.read()
 
-        # Pillow로 이미지 열기
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")  # JPEG을 위해 RGB로 변환
-        buffer = io.BytesIO()
-        image.save(buffer, format="JPEG")
-        jpeg_bytes = buffer.getvalue()
+        # 축소 + JPEG 변환 + base64 인코딩은 CPU 작업이므로 이미지 워커 풀에서 처리
+        vision_image = await run_in_image_pool(prepare_vision_image, image_bytes)
+        log_vision_image_stats(vision_image["stats"])
 
-        # base64 인코딩
-        image_base64 = base64.b64encode(jpeg_bytes).decode("utf-8")
+        # 비슷한 사진을 이미 분석했다면 그 결과를 재사용
+        content = find_vision_result(vision_image["dhash"])
+        if content is not None:
+            return {"success": True, "result": content, "image_stats": vision_image["stats"]}
 
         # GPT API 요청
-        response = openai.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[
                 {
@@ -41,18 +44,22 @@ async def analyze_product_image(file: UploadFile) -> dict:
                         {
                             "type": "image_url",
                             "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}",
-                                "detail": "high"
+                                "url": f"data:image/jpeg;base64,{vision_image['base64']}",
+                                "detail": vision_image["detail"]
                             }
                         }
                     ]
                 }
             ],
+            response_format=json_schema_response_format(VisionProduct),
             max_tokens=800
         )
 
         content = response.choices[0].message.content
-        return {"success": True, "result": content}
+        product = validate_product_json(content, VisionProduct)
+        if product is not None:
+            remember_vision_result(vision_image["dhash"], product)
+        return {"success": True, "result": content, "image_stats": vision_image["stats"]}
 
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -0,0 +1,110 @@
+"""
+상품 카탈로그.
+analyze_and_recommend가 성공할 때마다 상품 정보와 추천 결과(two_step 추천만)를 seein.db의 product_catalog 테이블에 기록하고,
+같은 상품(정규화된 상품명 + 브랜드)이 다시 인식되면 두 번째 GPT 추천 호출 없이 카탈로그 결과를 돌려줍니다.
+조회는 앱 시작 시 테이블에서 불러온 메모리 인덱스로 처리합니다.
+"""
+
+import threading
+
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.database_models import ProductCatalog
+from app.utils.text_utils import normalize_text
+
+
+def _catalog_key(name: str, brand: str) -> tuple[str, str]:
+    return normalize_text(name), normalize_text(brand)
+
+
+def _to_dict(product: ProductCatalog) -> dict:
+    return {
+        "name": product.name,
+        "brand": product.brand,
+        "summary": product.summary or "",
+        "recommendation": product.recommendation or "",
+    }
+
+
+def get_catalog_product(db: Session, name: str, brand: str) -> ProductCatalog | None:
+    """정규화된 상품명/브랜드 인덱스로 카탈로그 상품 조회"""
+    normalized_name, normalized_brand = _catalog_key(name, brand)
+    return (
+        db.query(ProductCatalog)
+        .filter(ProductCatalog.normalized_name == normalized_name, ProductCatalog.normalized_brand == normalized_brand)
+        .first()
+    )
+
+
+def upsert_catalog_product(db: Session, name: str, brand: str, summary: str, recommendation: str) -> ProductCatalog:
+    """카탈로그에 상품을 추가하거나, 이미 있으면 최신 정보로 갱신하고 인식 횟수를 늘림"""
+    product = get_catalog_product(db, name, brand)
+    if product is None:
+        normalized_name, normalized_brand = _catalog_key(name, brand)
+        product = ProductCatalog(
+            normalized_name=normalized_name,
+            normalized_brand=normalized_brand,
+            name=name,
+            brand=brand,
+            summary=summary,
+            recommendation=recommendation,
+            seen_count=1,
+        )
+        db.add(product)
+    else:
+        product.summary = summary or product.summary
+        product.recommendation = recommendation or product.recommendation
+        product.seen_count = (product.seen_count or 0) + 1
+
+    db.commit()
+    db.refresh(product)
+    return product
+
+
+class ProductCatalogIndex:
+    """product_catalog 테이블의 메모리 인덱스 ((정규화 상품명, 정규화 브랜드) → 상품 정보)"""
+
+    def __init__(self):
+        self._products: dict[tuple[str, str], dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """테이블 전체를 메모리 인덱스로 불러옴 (앱 시작 시 호출)"""
+        db = SessionLocal()
+        try:
+            products = {
+                (product.normalized_name, product.normalized_brand): _to_dict(product)
+                for product in db.query(ProductCatalog).all()
+            }
+        finally:
+            db.close()
+        with self._lock:
+            self._products = products
+        print(f"상품 카탈로그 로드 완료: {len(products)}개")
+
+    def get(self, name: str, brand: str) -> dict | None:
+        return self._products.get(_catalog_key(name, brand))
+
+    def _save(self, name: str, brand: str, summary: str, recommendation: str) -> None:
+        db = SessionLocal()
+        try:
+            product = upsert_catalog_product(db, name, brand, summary, recommendation)
+            with self._lock:
+                self._products[(product.normalized_name, product.normalized_brand)] = _to_dict(product)
+        except Exception as e:
+            db.rollback()
+            print(f"[상품 카탈로그] 저장 오류: {e}")
+        finally:
+            db.close()
+
+    async def add(self, name: str, brand: str, summary: str, recommendation: str) -> None:
+        """분석/추천 결과를 카탈로그 테이블과 메모리 인덱스에 반영"""
+        await run_in_threadpool(self._save, name, brand, summary, recommendation)
+
+    def __len__(self) -> int:
+        return len(self._products)
+
+
+product_catalog = ProductCatalogIndex()
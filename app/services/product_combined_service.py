@@ -1,80 +1,27 @@
 
 import openai
-import os
-import base64
-import io
-import json
-import re
-from PIL import Image
-from fastapi import UploadFile
-from dotenv import load_dotenv
-
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+import time
+from typing import AsyncIterator
 
+from fastapi import UploadFile
 
-async def analyze_and_recommend(file: UploadFile) -> dict:
-    try:
-        # 이미지 파일 → JPEG 변환
-        image_bytes = await file.read()
-        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-        buffer = io.BytesIO()
-        image.save(buffer, format="JPEG")
-        jpeg_bytes = buffer.getvalue()
-        image_base64 = base64.b64encode(jpeg_bytes).decode("utf-8")
-
-        # GPT Vision으로 상품 정보 분석 요청
-        vision_response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": "이 이미지 속 문구를 바탕으로 상품명과 브랜드를 추출해서 한국어로 JSON 형태로 알려줘. 상품에 대한 간단한 요약 설명도 덧붙여줘. 예시: {\"상품명\": \"진라면\", \"브랜드\": \"오뚜기\", \"요약\": \"매운맛 라면입니다.\"}"
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{image_base64}",
-                                "detail": "high"
-                            }
-                        }
-                    ]
-                }
-            ],
-            max_tokens=800
-        )
-
-        product_json = vision_response.choices[0].message.content.strip()
-
-        # ```json ... ``` 제거
-        product_json_cleaned = re.sub(r"```json|```", "", product_json).strip()
-
-        try:
-            product_info = json.loads(product_json_cleaned)
-        except Exception as e:
-            return {
-                "success": False,
-                "error": "상품 정보 JSON 파싱 실패",
-                "raw": product_json,
-                "parsed_attempt": product_json_cleaned
-            }
-
-        name = product_info.get("상품명", "")
-        brand = product_info.get("브랜드", "")
-        summary = product_info.get("요약", "")
+from app.core.clients import get_async_openai_client
+from app.core.config import PRODUCT_ANALYZE_MODE
+from app.core.workers import run_in_image_pool
+from app.models.product_model import VisionProduct, VisionProductRecommendation
+from app.services.product_catalog_service import product_catalog
+from app.services.product_image_index import find_vision_result, remember_vision_result
+from app.services.product_json_service import json_schema_response_format, parse_product_json
+from app.services.product_recommendation_service import (
+    cached_recommendation,
+    cached_recommendation_stream,
+    stream_completion,
+)
+from app.utils.image_utils import prepare_vision_image, log_vision_image_stats
 
-        if not name or not brand:
-            return {
-                "success": False,
-                "error": "상품명 또는 브랜드 추출 실패",
-                "raw": product_info
-            }
 
-        # 추천 요청 프롬프트 구성
-        prompt = f"""
+def _detailed_recommendation_prompt(name: str, brand: str, summary: str) -> str:
+    return f"""
 당신은 소비 조언 전문가입니다. 아래 상품에 대해 사용자가 구매를 고민하고 있습니다. 건강, 가격, 유사 제품과 비교 등 다양한 관점에서 분석해 간단한 한국어로 구매 추천 여부를 알려주세요.  
 추천 여부는 "추천: 살 것 같음" 또는 "추천: 사지 말 것 같음" 중 하나로 시작하고, 이유는 짧게 설명해 주세요.  
 
@@ -84,23 +31,240 @@ async def analyze_and_recommend(file: UploadFile) -> dict:
 - 요약: {summary}
 """
 
-        recommend_response = openai.chat.completions.create(
-            model="gpt-4o",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500
-        )
 
-        recommendation = recommend_response.choices[0].message.content.strip()
+async def _generate_detailed_recommendation(client: openai.AsyncOpenAI, name: str, brand: str, summary: str) -> str:
+    # 추천 요청 프롬프트 구성
+    prompt = _detailed_recommendation_prompt(name, brand, summary)
+
+    recommend_response = await client.chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=500
+    )
+
+    return recommend_response.choices[0].message.content.strip()
+
+
+async def _analyze_with_vision(client: openai.AsyncOpenAI, vision_image: dict) -> str:
+    vision_response = await client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "이 이미지 속 문구를 바탕으로 상품명과 브랜드를 추출해서 한국어로 JSON 형태로 알려줘. 상품에 대한 간단한 요약 설명도 덧붙여줘. 예시: {\"상품명\": \"진라면\", \"브랜드\": \"오뚜기\", \"요약\": \"매운맛 라면입니다.\"}"
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{vision_image['base64']}",
+                            "detail": vision_image["detail"]
+                        }
+                    }
+                ]
+            }
+        ],
+        response_format=json_schema_response_format(VisionProduct),
+        max_tokens=800
+    )
+
+    return vision_response.choices[0].message.content
+
+
+async def _analyze_and_recommend_with_vision(client: openai.AsyncOpenAI, vision_image: dict) -> str:
+    """Vision 호출 한 번으로 상품 정보와 추천을 함께 받음 (상품명/브랜드/요약/추천 JSON)"""
+    vision_response = await client.chat.completions.create(
+        model="gpt-4o",
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": (
+                            "이 이미지 속 문구를 바탕으로 상품명과 브랜드를 추출하고 상품에 대한 간단한 요약 설명을 한국어로 작성해줘. "
+                            "그리고 소비 조언 전문가로서 건강, 가격, 유사 제품과 비교 등 다양한 관점에서 구매 추천 여부를 알려줘. "
+                            "추천은 \"추천: 살 것 같음\" 또는 \"추천: 사지 말 것 같음\" 중 하나로 시작하고, 이유는 짧게 설명해줘. "
+                            "다음 키를 가진 JSON 객체로 응답해줘. "
+                            "예시: {\"상품명\": \"진라면\", \"브랜드\": \"오뚜기\", \"요약\": \"매운맛 라면입니다.\", "
+                            "\"추천\": \"추천: 살 것 같음\\n이유: 가격 대비 양이 많습니다.\"}"
+                        )
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:image/jpeg;base64,{vision_image['base64']}",
+                            "detail": vision_image["detail"]
+                        }
+                    }
+                ]
+            }
+        ],
+        response_format=json_schema_response_format(VisionProductRecommendation),
+        max_tokens=1000
+    )
+
+    return vision_response.choices[0].message.content
+
+
+async def _extract_product(client: openai.AsyncOpenAI, image_bytes: bytes, mode: str) -> dict:
+    """
+    이미지에서 상품 정보를 추출합니다.
+
+    Returns:
+        dict: 성공 시 {"success": True, "product": {...}, "recommendation": single 모드 추천 또는 "", "image_stats": ...},
+              실패 시 {"success": False, "error": ..., "raw": ...}
+    """
+    # 이미지 파일 → 축소 + JPEG 변환 (이미지 워커 풀에서 처리)
+    vision_image = await run_in_image_pool(prepare_vision_image, image_bytes)
+    log_vision_image_stats(vision_image["stats"])
+
+    # 같은 방식으로 비슷한 사진을 이미 분석했다면 그 결과를 재사용, 아니면 GPT Vision으로 상품 정보 분석 요청
+    product_json = find_vision_result(vision_image["dhash"], mode)
+    model_cls = VisionProductRecommendation if mode == "single" else VisionProduct
+    if product_json is None:
+        if mode == "single":
+            product_json = await _analyze_and_recommend_with_vision(client, vision_image)
+        else:
+            product_json = await _analyze_with_vision(client, vision_image)
+
+    # 스키마 검증 → 로컬 복구 → 텍스트 전용 복구 호출 (Vision 재호출 없음)
+    product = await parse_product_json(product_json, model_cls, client)
+    if product is None:
+        return {
+            "success": False,
+            "error": "상품 정보 JSON 파싱 실패",
+            "raw": product_json
+        }
+
+    if not product.name or not product.brand:
+        return {
+            "success": False,
+            "error": "상품명 또는 브랜드 추출 실패",
+            "raw": product.model_dump(by_alias=True)
+        }
+
+    remember_vision_result(vision_image["dhash"], product, mode)
+    name, brand, summary = product.name, product.brand, product.summary
+    single_recommendation = product.recommendation.strip() if isinstance(product, VisionProductRecommendation) else ""
+
+    return {
+        "success": True,
+        "product": {
+            "name": name,
+            "brand": brand,
+            "summary": summary
+        },
+        "recommendation": single_recommendation,
+        "image_stats": vision_image["stats"]
+    }
+
+
+def _catalog_recommendation(name: str, brand: str) -> str | None:
+    """이미 카탈로그에 있는 상품이면 저장된 추천을 반환 (두 번째 GPT 호출 생략)"""
+    known_product = product_catalog.get(name, brand)
+    if known_product and known_product["recommendation"]:
+        print(f"[상품 카탈로그 적중] {name} / {brand}")
+        return known_product["recommendation"]
+    return None
+
+
+async def analyze_and_recommend(
+    file: UploadFile, client: openai.AsyncOpenAI | None = None, mode: str | None = None
+) -> dict:
+    """
+    상품 이미지 분석 + 구매 추천.
+
+    mode:
+        two_step - Vision으로 상품 정보를 추출한 뒤 추천을 별도로 요청 (카탈로그/추천 캐시 활용)
+        single   - Vision 호출 한 번으로 상품 정보와 추천을 함께 받음 (응답 지연 감소)
+        None     - PRODUCT_ANALYZE_MODE 설정값 사용
+
+    응답의 mode는 실제로 추천을 만든 방식입니다. single 응답에 추천이 비어 있으면 two_step 추천으로 보완하므로 two_step이 됩니다.
+    카탈로그에는 two_step 추천만 저장하여, two_step 요청이 single 추천을 돌려받지 않도록 합니다.
+    """
+    mode = mode or PRODUCT_ANALYZE_MODE
+    if mode not in ("two_step", "single"):
+        return {"success": False, "error": f"지원하지 않는 분석 모드입니다: {mode}"}
+
+    client = client or get_async_openai_client()
+    if client is None:
+        return {"success": False, "error": "OpenAI 클라이언트를 사용할 수 없습니다. OPENAI_API_KEY를 확인하세요."}
+
+    started = time.perf_counter()
+    try:
+        image_bytes = await file.read()
+        extracted = await _extract_product(client, image_bytes, mode)
+        if not extracted["success"]:
+            return extracted
+
+        name, brand, summary = (extracted["product"][key] for key in ("name", "brand", "summary"))
+        recommendation = extracted["recommendation"]
+        if not recommendation:
+            mode = "two_step"
+            recommendation = _catalog_recommendation(name, brand) or await cached_recommendation(
+                name, brand, summary,
+                lambda: _generate_detailed_recommendation(client, name, brand, summary),
+                variant="detailed",
+            )
+        # single 추천은 카탈로그에 남기지 않고 상품 정보만 기록 (single 추천은 single 이미지 인덱스에만 보관)
+        await product_catalog.add(name, brand, summary, recommendation if mode == "two_step" else "")
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000)
+        print(f"[상품 분석+추천] mode={mode}, {elapsed_ms}ms")
 
         return {
             "success": True,
-            "product": {
-                "name": name,
-                "brand": brand,
-                "summary": summary
-            },
-            "recommendation": recommendation
+            "product": extracted["product"],
+            "recommendation": recommendation,
+            "mode": mode,
+            "elapsed_ms": elapsed_ms,
+            "image_stats": extracted["image_stats"]
         }
 
     except Exception as e:
         return {"success": False, "error": str(e)}
+
+
+async def stream_analyze_and_recommend(
+    image_bytes: bytes, client: openai.AsyncOpenAI | None = None
+) -> AsyncIterator[tuple[str, dict]]:
+    """
+    analyze_and_recommend의 스트리밍 버전 (two_step 방식).
+    ("product", 상품 정보) → ("delta", {"text": 추천 조각})... → ("done", {"recommendation": 전체 추천}) 순서로 내보내며,
+    실패 시 ("error", {...})를 내보내고 끝냅니다.
+    """
+    client = client or get_async_openai_client()
+    if client is None:
+        yield "error", {"success": False, "error": "OpenAI 클라이언트를 사용할 수 없습니다. OPENAI_API_KEY를 확인하세요."}
+        return
+
+    try:
+        extracted = await _extract_product(client, image_bytes, "two_step")
+        if not extracted["success"]:
+            yield "error", extracted
+            return
+        yield "product", {**extracted["product"], "image_stats": extracted["image_stats"]}
+
+        name, brand, summary = (extracted["product"][key] for key in ("name", "brand", "summary"))
+        recommendation = _catalog_recommendation(name, brand)
+        if recommendation:
+            yield "delta", {"text": recommendation}
+        else:
+            parts = []
+            async for text in cached_recommendation_stream(
+                name, brand, summary,
+                lambda: stream_completion(client, _detailed_recommendation_prompt(name, brand, summary)),
+                variant="detailed",
+            ):
+                parts.append(text)
+                yield "delta", {"text": text}
+            recommendation = "".join(parts).strip()
+
+        await product_catalog.add(name, brand, summary, recommendation)
+        yield "done", {"success": True, "recommendation": recommendation}
+
+    except Exception as e:
+        yield "error", {"success": False, "error": str(e)}
@@ -0,0 +1,142 @@
+"""
+상품 이미지 지각 해시(dHash) 인덱스.
+여러 사용자가 같은 상품 포장을 조금씩 다른 각도로 찍어도 해시의 해밍 거리가 가까우면
+이전 GPT Vision 결과를 재사용하여 모델 호출을 생략합니다.
+
+해시를 (max_distance + 1)개의 비트 구간(band)으로 나누면, 거리가 max_distance 이하인 두 해시는
+비둘기집 원리에 따라 적어도 한 구간이 정확히 일치합니다. 구간 값별 버킷에서 후보만 골라 거리를 계산하므로
+전체를 훑지 않고도 수백만 개 규모에서 근접 이웃을 찾을 수 있습니다.
+
+인덱스는 메모리에만 있으므로 앱을 재시작하면 비워지며, max_entries에 도달하면 가장 오래된 항목의 자리를 재사용(FIFO)합니다.
+"""
+
+import threading
+from array import array
+
+from app.core.config import PRODUCT_PHASH_ENABLED, PRODUCT_PHASH_MAX_DISTANCE, PRODUCT_PHASH_MAX_ENTRIES
+from app.models.product_model import VisionProduct
+
+HASH_BITS = 64
+
+
+class PerceptualHashIndex:
+    """
+    64비트 지각 해시 → 값 근접 이웃 인덱스 (해시는 array('Q'), 버킷은 array('I')로 압축 저장)
+    가득 차면 가장 오래 전에 추가된 슬롯을 비우고 새 항목을 그 자리에 저장합니다.
+    """
+
+    def __init__(self, max_distance: int = PRODUCT_PHASH_MAX_DISTANCE, max_entries: int = PRODUCT_PHASH_MAX_ENTRIES):
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+
+        band_count = max(1, min(HASH_BITS, max_distance + 1))
+        base, extra = divmod(HASH_BITS, band_count)
+        self._bands: list[tuple[int, int]] = []  # (shift, mask)
+        shift = 0
+        for band in range(band_count):
+            width = base + (1 if band < extra else 0)
+            self._bands.append((shift, (1 << width) - 1))
+            shift += width
+
+        self._hashes = array("Q")
+        self._values: list = []
+        self._buckets: list[dict[int, array]] = [{} for _ in self._bands]
+        self._next_slot = 0  # 가득 찬 뒤 다음에 재사용할 (가장 오래된) 슬롯
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def nearest(self, image_hash: int) -> tuple[object, int] | None:
+        """해밍 거리가 max_distance 이하인 가장 가까운 항목의 (값, 거리) 반환"""
+        with self._lock:
+            return self._nearest(image_hash)
+
+    def _nearest(self, image_hash: int) -> tuple[object, int] | None:
+        best_index, best_distance = -1, self.max_distance + 1
+        seen: set[int] = set()
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            candidates = buckets.get((image_hash >> shift) & mask)
+            if candidates is None:
+                continue
+            for index in candidates:
+                if index in seen:
+                    continue
+                seen.add(index)
+                distance = (self._hashes[index] ^ image_hash).bit_count()
+                if distance < best_distance:
+                    best_index, best_distance = index, distance
+                    if distance == 0:
+                        return self._values[index], 0
+        if best_index < 0:
+            return None
+        return self._values[best_index], best_distance
+
+    def add(self, image_hash: int, value) -> bool:
+        """해시와 값을 인덱스에 추가 (같은 해시가 이미 있으면 추가하지 않고, 가득 차면 가장 오래된 항목을 대체)"""
+        if self.max_entries <= 0:
+            return False
+        with self._lock:
+            match = self._nearest(image_hash)
+            if match is not None and match[1] == 0:
+                return False
+
+            if len(self._hashes) < self.max_entries:
+                index = len(self._hashes)
+                self._hashes.append(image_hash)
+                self._values.append(value)
+            else:
+                index = self._next_slot
+                self._next_slot = (index + 1) % self.max_entries
+                self._remove_from_buckets(index, self._hashes[index])
+                self._hashes[index] = image_hash
+                self._values[index] = value
+
+            for (shift, mask), buckets in zip(self._bands, self._buckets):
+                buckets.setdefault((image_hash >> shift) & mask, array("I")).append(index)
+            return True
+
+    def _remove_from_buckets(self, index: int, image_hash: int) -> None:
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            key = (image_hash >> shift) & mask
+            bucket = buckets[key]
+            bucket.remove(index)
+            if not bucket:
+                del buckets[key]
+
+# dHash → GPT Vision 결과. 분석 방식(mode)마다 응답 내용이 다르므로 인덱스를 따로 둠
+#   two_step: 상품명/브랜드/요약 JSON
+#   single:   상품명/브랜드/요약/추천 JSON
+product_image_indexes = {"two_step": PerceptualHashIndex(), "single": PerceptualHashIndex()}
+
+_INDEXED_FIELDS = {
+    "two_step": {"name", "brand", "summary"},
+    "single": {"name", "brand", "summary", "recommendation"},
+}
+
+
+def find_vision_result(image_hash: int, mode: str = "two_step") -> str | None:
+    """같은 mode로 분석한 비슷한 사진의 이전 GPT Vision 응답을 찾아 반환 (없으면 None)"""
+    if not PRODUCT_PHASH_ENABLED or image_hash == 0:  # 0은 밝기 변화가 없는 단색 이미지라 비교 의미가 없음
+        return None
+    match = product_image_indexes[mode].nearest(image_hash)
+    if match is None:
+        return None
+    content, distance = match
+    print(f"[상품 이미지 중복] dHash {image_hash:016x} 거리 {distance} ({mode}) → Vision 호출 생략")
+    return content
+
+
+def remember_vision_result(image_hash: int, product: VisionProduct, mode: str = "two_step") -> None:
+    """
+    상품명과 브랜드가 제대로 추출된 결과만 mode별 인덱스에 저장
+    single 결과는 추천까지 있어야 재사용할 수 있으므로 추천이 비어 있으면 저장하지 않음
+    """
+    if not PRODUCT_PHASH_ENABLED or image_hash == 0:
+        return
+    if not (product.name and product.brand):
+        return
+    if mode == "single" and not getattr(product, "recommendation", ""):
+        return
+    content = product.model_dump_json(by_alias=True, include=_INDEXED_FIELDS[mode])
+    product_image_indexes[mode].add(image_hash, content)
@@ -0,0 +1,91 @@
+"""
+상품 Vision 응답(JSON) 검증 및 복구.
+응답은 json_schema 구조화 출력으로 요청하고 Pydantic 모델로 검증합니다.
+형식이 어긋난 경우 코드 펜스 제거 등 로컬 복구를 먼저 시도하고, 그래도 실패하면
+이미지 없이 응답 텍스트만 저렴한 모델에 보내 JSON을 고칩니다. (Vision 재호출 없음)
+"""
+
+import json
+import re
+from typing import TypeVar
+
+import openai
+from pydantic import BaseModel, ValidationError
+
+from app.core.config import PRODUCT_JSON_REPAIR_MODEL
+
+ProductModel = TypeVar("ProductModel", bound=BaseModel)
+
+
+def json_schema_response_format(model_cls: type[BaseModel]) -> dict:
+    """Pydantic 모델 → chat.completions response_format (strict json_schema)"""
+    schema = model_cls.model_json_schema(by_alias=True)
+    schema.pop("title", None)
+    for prop in schema["properties"].values():
+        prop.pop("title", None)
+        prop.pop("default", None)
+    schema["required"] = list(schema["properties"])  # strict 모드는 모든 키가 필수
+    schema["additionalProperties"] = False
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": model_cls.__name__, "strict": True, "schema": schema},
+    }
+
+
+def _repair_json_locally(content: str) -> str:
+    """코드 펜스, 앞뒤 설명 문장, 닫는 괄호 앞 쉼표 제거"""
+    text = re.sub(r"```(?:json)?", "", content).strip()
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+    return re.sub(r",\s*([}\]])", r"\1", text)
+
+
+def validate_product_json(content: str | None, model_cls: type[ProductModel]) -> ProductModel | None:
+    """응답 문자열을 모델로 검증 (실패 시 로컬 복구 후 한 번 더 시도)"""
+    if not content:
+        return None
+    try:
+        return model_cls.model_validate_json(content)
+    except ValidationError:
+        pass
+    try:
+        return model_cls.model_validate_json(_repair_json_locally(content))
+    except ValidationError:
+        return None
+
+
+async def parse_product_json(
+    content: str | None, model_cls: type[ProductModel], client: openai.AsyncOpenAI
+) -> ProductModel | None:
+    """
+    Vision 응답을 모델로 변환합니다.
+    검증 → 로컬 복구 → (텍스트 전용) 복구 호출 순서로 시도하며, 모두 실패하면 None을 반환합니다.
+    """
+    product = validate_product_json(content, model_cls)
+    if product is not None or not content:
+        return product
+
+    print(f"[상품 JSON 복구] 스키마 불일치 → {PRODUCT_JSON_REPAIR_MODEL}로 복구 요청")
+    schema = json_schema_response_format(model_cls)
+    try:
+        response = await client.chat.completions.create(
+            model=PRODUCT_JSON_REPAIR_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "주어진 텍스트의 내용을 바꾸지 말고 다음 JSON 스키마에 맞는 JSON 객체로만 고쳐서 응답해줘.\n"
+                        + json.dumps(schema["json_schema"]["schema"], ensure_ascii=False)
+                    )
+                },
+                {"role": "user", "content": content}
+            ],
+            response_format=schema,
+            max_tokens=800
+        )
+    except Exception as e:
+        print(f"[상품 JSON 복구 오류] {e}")
+        return None
+
+    return validate_product_json(response.choices[0].message.content, model_cls)
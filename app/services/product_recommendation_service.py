@@ -1,13 +1,107 @@
 import openai
-import os
-from dotenv import load_dotenv
+from typing import AsyncIterator, Awaitable, Callable
 
-load_dotenv()
-openai.api_key = os.getenv("OPENAI_API_KEY")
+from app.core.cache import MemoryCache, SQLiteCache, content_hash
+from app.core.clients import get_async_openai_client
+from app.core.config import (
+    RECOMMENDATION_CACHE_TTL_SECONDS,
+    RECOMMENDATION_CACHE_MAX_ENTRIES,
+    RECOMMENDATION_CACHE_PERSIST,
+)
+from app.utils.text_utils import normalize_text
 
+EMPTY_RECOMMENDATION = "추천 결과를 가져오지 못했습니다."
 
-def generate_product_recommendation(name: str, brand: str, flavor: str = "") -> str:
-    prompt = f"""
+# (상품명, 브랜드, 요약) → 추천 문구. RECOMMENDATION_CACHE_PERSIST=true면 seein.db에 저장하여 재시작 후에도 유지
+_cache_class = SQLiteCache if RECOMMENDATION_CACHE_PERSIST else MemoryCache
+recommendation_cache = _cache_class(
+    namespace="product_recommendation",
+    ttl_seconds=RECOMMENDATION_CACHE_TTL_SECONDS,
+    max_entries=RECOMMENDATION_CACHE_MAX_ENTRIES,
+)
+
+
+def recommendation_cache_key(name: str, brand: str, summary: str = "", variant: str = "simple") -> str:
+    """정규화된 (프롬프트 종류, 상품명, 브랜드, 요약)으로 추천 캐시 키 생성"""
+    parts = [variant, normalize_text(name), normalize_text(brand), normalize_text(summary)]
+    return content_hash("\x1f".join(parts).encode("utf-8"))
+
+
+async def cached_recommendation(
+    name: str, brand: str, summary: str, generate: Callable[[], Awaitable[str]], variant: str = "simple"
+) -> str:
+    """추천 캐시를 먼저 확인하고, 없을 때만 generate()로 GPT 추천을 생성하여 저장"""
+    key = recommendation_cache_key(name, brand, summary, variant)
+    cached = await recommendation_cache.aget(key)
+    if cached is not None:
+        print(f"[추천 캐시 적중] {name} / {brand}")
+        return cached
+
+    reply = await generate()
+    if reply and reply != EMPTY_RECOMMENDATION:
+        await recommendation_cache.aset(key, reply)
+    return reply
+
+
+async def cached_recommendation_stream(
+    name: str, brand: str, summary: str, generate_stream: Callable[[], AsyncIterator[str]], variant: str = "simple"
+) -> AsyncIterator[str]:
+    """cached_recommendation의 스트리밍 버전. 캐시 적중 시 저장된 추천을 한 번에 내보내고, 아니면 토큰 조각을 그대로 전달"""
+    key = recommendation_cache_key(name, brand, summary, variant)
+    cached = await recommendation_cache.aget(key)
+    if cached is not None:
+        print(f"[추천 캐시 적중] {name} / {brand}")
+        yield cached
+        return
+
+    parts = []
+    async for text in generate_stream():
+        parts.append(text)
+        yield text
+
+    # 스트림이 끝까지 전달된 경우에만 저장 (중간에 연결이 끊기면 여기까지 오지 않음)
+    reply = "".join(parts).strip()
+    if reply:
+        await recommendation_cache.aset(key, reply)
+
+
+async def stream_completion(client: openai.AsyncOpenAI, prompt: str, max_tokens: int = 500) -> AsyncIterator[str]:
+    """gpt-4o 응답을 stream=True로 받아 텍스트 조각 단위로 내보냄"""
+    stream = await client.chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": prompt}],
+        max_tokens=max_tokens,
+        stream=True
+    )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+async def get_product_recommendation(name: str, brand: str, flavor: str = "", client: openai.AsyncOpenAI | None = None) -> str:
+    """캐시를 거치는 generate_product_recommendation"""
+    return await cached_recommendation(
+        name, brand, flavor,
+        lambda: generate_product_recommendation(name=name, brand=brand, flavor=flavor, client=client),
+    )
+
+
+def stream_product_recommendation(
+    name: str, brand: str, flavor: str = "", client: openai.AsyncOpenAI | None = None
+) -> AsyncIterator[str]:
+    """캐시를 거치는 스트리밍 추천 ("추천: ..." 판정 줄부터 토큰 단위로 전달)"""
+    client = client or get_async_openai_client()
+    if client is None:
+        raise RuntimeError("OpenAI 클라이언트를 사용할 수 없습니다. OPENAI_API_KEY를 확인하세요.")
+
+    return cached_recommendation_stream(
+        name, brand, flavor,
+        lambda: stream_completion(client, _recommendation_prompt(name, brand, flavor)),
+    )
+
+
+def _recommendation_prompt(name: str, brand: str, flavor: str = "") -> str:
+    return f"""
 당신은 소비자 조언가입니다. 아래 상품에 대해 사용자가 구매를 고민하고 있습니다.
 다음 형식을 따라 간단하게 응답해 주세요.
 
@@ -21,8 +115,16 @@ def generate_product_recommendation(name: str, brand: str, flavor: str = "") ->
 - 특징 또는 요약: {flavor}
 """
 
+
+async def generate_product_recommendation(name: str, brand: str, flavor: str = "", client: openai.AsyncOpenAI | None = None) -> str:
+    client = client or get_async_openai_client()
+    if client is None:
+        raise RuntimeError("OpenAI 클라이언트를 사용할 수 없습니다. OPENAI_API_KEY를 확인하세요.")
+
+    prompt = _recommendation_prompt(name, brand, flavor)
+
     try:
-        response = openai.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o",
             messages=[{"role": "user", "content": prompt}],
             max_tokens=500
@@ -32,7 +134,7 @@ def generate_product_recommendation(name: str, brand: str, flavor: str = "") ->
 
         if reply is None or not reply.strip():
             print("[GPT 응답 없음]")
-            return "추천 결과를 가져오지 못했습니다."
+            return EMPTY_RECOMMENDATION
 
         print(f"[GPT 추천 결과] {reply.strip()}")
         return reply.strip()
@@ -49,7 +151,7 @@ def generate_product_recommendation(name: str, brand: str, flavor: str = "") ->
 # - 브랜드: {brand}
 # - 맛: {flavor}
 # """
-    response = openai.chat.completions.create(
+    response = await client.chat.completions.create(
         model="gpt-4o",
         messages=[{"role": "user", "content": prompt}],
         max_tokens=500
@@ -1,22 +1,39 @@
 # your_project/services/receipt_analyzer.py
 
-import requests
+import asyncio
+import base64
 import uuid
 import time
 import json
 import os
+import httpx
 import openai
+from typing import BinaryIO
+
+from app.core.clients import get_ocr_client, get_async_openai_client
+
+# 클로바 OCR이 지원하는 이미지 형식 (확장자 → format 값)
+CLOVA_IMAGE_FORMATS = {"jpg": "jpg", "jpeg": "jpg", "png": "png"}
+
+
+def clova_image_format(filename_or_ext: str | None) -> str:
+    """파일명 또는 확장자로 클로바 OCR 요청의 format 값을 결정 (알 수 없으면 jpg)"""
+    ext = (filename_or_ext or "").rsplit(".", 1)[-1].lower()
+    return CLOVA_IMAGE_FORMATS.get(ext, "jpg")
+
 
 # --- [1] CLOVA OCR API 호출 ---
 # API URL과 SECRET KEY를 함수 인자로 받도록 변경
-def call_clova_ocr(image_path: str, api_url: str, secret_key: str) -> dict | None:
+async def call_clova_ocr(image: bytes | BinaryIO, api_url: str, secret_key: str, image_format: str = "jpg") -> dict | None:
     """
-    클로바 OCR API를 호출하여 영수증 이미지에서 텍스트를 추출합니다.
+    클로바 OCR API를 비동기로 호출하여 영수증 이미지에서 텍스트를 추출합니다.
+    이미지는 디스크를 거치지 않고 메모리(bytes) 또는 업로드 버퍼(파일 객체)에서 바로 전송됩니다.
 
     Args:
-        image_path (str): 분석할 영수증 이미지의 파일 경로.
+        image (bytes | BinaryIO): 분석할 영수증 이미지 내용 또는 읽기 가능한 바이너리 버퍼.
         api_url (str): 클로바 OCR Invoke URL.
         secret_key (str): 클로바 OCR Secret Key.
+        image_format (str): 이미지 형식 (jpg, png).
 
     Returns:
         dict | None: OCR API 응답 JSON (성공 시) 또는 None (실패 시).
@@ -25,42 +42,44 @@ def call_clova_ocr(image_path: str, api_url: str, secret_key: str) -> dict | Non
         print("❗ DEBUG: [receipt_analyzer.py] 클로바 OCR API URL 또는 Secret Key가 함수 인자로 전달되지 않았습니다.")
         return None
 
+    if not image:
+        print("❗ DEBUG: [receipt_analyzer.py] 이미지 데이터가 비어 있습니다.")
+        return None
+
     request_json = {
-        'images': [{'format': 'jpg', 'name': 'receipt_image'}], # 이미지 형식 확인 (jpg, png 등)
+        'images': [{'format': image_format, 'name': 'receipt_image'}],
         'requestId': str(uuid.uuid4()),
         'version': 'V2',
         'timestamp': int(round(time.time() * 1000))
     }
 
     try:
-        # 이미지 파일이 실제로 존재하는지 확인하는 디버깅 코드 추가
-        if not os.path.exists(image_path):
-            print(f"❗ DEBUG: [receipt_analyzer.py] 이미지 파일이 존재하지 않습니다: {image_path}")
-            return None
+        # 파일 객체가 전달된 경우 처음부터 읽도록 위치를 되돌림
+        if hasattr(image, 'seek'):
+            image.seek(0)
 
-        with open(image_path, 'rb') as f:
-            files = [('file', f)]
-            headers = {'X-OCR-SECRET': secret_key} # secret_key 인자 사용
-            payload = {'message': json.dumps(request_json)}
+        files = [('file', (f'receipt_image.{image_format}', image))]
+        headers = {'X-OCR-SECRET': secret_key} # secret_key 인자 사용
+        payload = {'message': json.dumps(request_json)}
 
-            print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API URL: {api_url}")
-            # 보안을 위해 Secret Key는 앞부분만 출력
-            print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR Secret Key (일부): {secret_key[:5]}...")
-            print(f"DEBUG: [receipt_analyzer.py] 이미지 파일 경로: {image_path}")
-            print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API로 요청 전송 시도...")
+        print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API URL: {api_url}")
+        # 보안을 위해 Secret Key는 앞부분만 출력
+        print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR Secret Key (일부): {secret_key[:5]}...")
+        print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API로 요청 전송 시도...")
 
-            response = requests.post(api_url, headers=headers, data=payload, files=files)
+        # 앱 전체에서 공유하는 커넥션 풀을 사용하여 매 요청마다 TCP/TLS 핸드셰이크를 반복하지 않음
+        response = await get_ocr_client().post(api_url, headers=headers, data=payload, files=files)
 
-            # --- 핵심 디버깅 부분 ---
-            print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API 응답 상태 코드: {response.status_code}")
-            print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API 응답 내용: {response.text}") # 응답 전체를 출력하여 자세한 오류 확인
-            # --- 여기까지 ---
+        # --- 핵심 디버깅 부분 ---
+        print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API 응답 상태 코드: {response.status_code}")
+        print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API 응답 내용: {response.text}") # 응답 전체를 출력하여 자세한 오류 확인
+        # --- 여기까지 ---
 
         response.raise_for_status() # HTTP 4xx/5xx 에러 발생 시 여기서 예외 발생
 
         return response.json()
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"❗ [receipt_analyzer.py] 클로바 OCR API 호출 중 네트워크 또는 요청 관련 오류 발생: {e}")
         return None
     except json.JSONDecodeError as e:
@@ -71,6 +90,71 @@ def call_clova_ocr(image_path: str, api_url: str, secret_key: str) -> dict | Non
         print(f"❗ [receipt_analyzer.py] OCR 처리 중 예상치 못한 오류 발생: {type(e).__name__}: {e}")
         return None
 
+
+async def call_clova_ocr_multi(images: list[tuple[bytes, str]], api_url: str, secret_key: str) -> list[dict | None]:
+    """
+    여러 장의 영수증 이미지를 클로바 OCR 요청 1건으로 묶어 보내고, 응답의 images[]를 입력 순서대로 나눠 돌려줍니다.
+    한 장뿐이면 base64 인코딩이 필요 없는 multipart 방식(call_clova_ocr)을 그대로 사용합니다.
+
+    Args:
+        images (list[tuple[bytes, str]]): (이미지 내용, 이미지 형식) 목록.
+        api_url (str): 클로바 OCR Invoke URL.
+        secret_key (str): 클로바 OCR Secret Key.
+
+    Returns:
+        list[dict | None]: 입력 이미지별 OCR 결과. 각 항목은 images[]에 해당 이미지 하나만 담긴
+        단건 응답과 같은 형태이며, 실패한 이미지는 None입니다.
+    """
+    if len(images) == 1:
+        content, image_format = images[0]
+        return [await call_clova_ocr(content, api_url, secret_key, image_format)]
+
+    if not api_url or not secret_key:
+        print("❗ DEBUG: [receipt_analyzer.py] 클로바 OCR API URL 또는 Secret Key가 함수 인자로 전달되지 않았습니다.")
+        return [None] * len(images)
+
+    names = [f'receipt_image_{index}' for index in range(len(images))]
+    request_json = {
+        'images': [
+            {'format': image_format, 'name': name, 'data': base64.b64encode(content).decode('utf-8')}
+            for name, (content, image_format) in zip(names, images)
+        ],
+        'requestId': str(uuid.uuid4()),
+        'version': 'V2',
+        'timestamp': int(round(time.time() * 1000))
+    }
+
+    try:
+        print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API로 이미지 {len(images)}장 묶음 요청 전송 시도...")
+        response = await get_ocr_client().post(api_url, headers={'X-OCR-SECRET': secret_key}, json=request_json)
+        print(f"DEBUG: [receipt_analyzer.py] 클로바 OCR API 응답 상태 코드: {response.status_code}")
+        response.raise_for_status()
+        ocr_json = response.json()
+    except httpx.HTTPError as e:
+        print(f"❗ [receipt_analyzer.py] 클로바 OCR 묶음 요청 중 네트워크 또는 요청 관련 오류 발생: {e}")
+        return [None] * len(images)
+    except json.JSONDecodeError as e:
+        print(f"❗ [receipt_analyzer.py] 클로바 OCR 묶음 응답 JSON 파싱 중 오류 발생: {e}")
+        return [None] * len(images)
+
+    # 응답 이미지를 name으로 매칭 (name이 없으면 순서대로)
+    response_images = ocr_json.get('images', [])
+    by_name = {image.get('name'): image for image in response_images}
+    common = {key: value for key, value in ocr_json.items() if key != 'images'}
+
+    results = []
+    for index, name in enumerate(names):
+        image = by_name.get(name)
+        if image is None and index < len(response_images) and not response_images[index].get('name'):
+            image = response_images[index]
+
+        if image is None or image.get('inferResult') not in (None, 'SUCCESS'):
+            print(f"❗ [receipt_analyzer.py] 클로바 OCR 묶음 응답에서 {name} 인식 실패: {image.get('message') if image else '응답 없음'}")
+            results.append(None)
+        else:
+            results.append({**common, 'images': [image]})
+    return results
+
 # --- [2] OCR 텍스트 추출 ---
 def extract_texts_from_clova(ocr_json: dict | None) -> str:
     """
@@ -90,24 +174,23 @@ def extract_texts_from_clova(ocr_json: dict | None) -> str:
     return ' '.join(texts)
 
 # --- [3] OpenAI (GPT) 활용하여 영수증 정보 추출 ---
-# OPENAI_API_KEY를 함수 인자로 받도록 변경
-def extract_receipt_info_with_gpt(ocr_text_content: str, openai_api_key: str) -> dict | None:
+# OpenAI 클라이언트는 앱 공용 클라이언트를 주입받아 사용 (요청마다 새로 생성하지 않음)
+async def extract_receipt_info_with_gpt(ocr_text_content: str, client: openai.AsyncOpenAI | None = None) -> dict | None:
     """
-    GPT 모델을 사용하여 OCR로 추출된 텍스트에서 영수증 정보를 추출합니다.
+    GPT 모델을 비동기로 호출하여 OCR로 추출된 텍스트에서 영수증 정보를 추출합니다.
 
     Args:
         ocr_text_content (str): OCR로 추출된 영수증의 전체 텍스트 내용.
-        openai_api_key (str): OpenAI API Key.
+        client (openai.AsyncOpenAI | None): 사용할 OpenAI 비동기 클라이언트. 생략하면 앱 공용 클라이언트를 사용합니다.
 
     Returns:
         dict | None: 추출된 영수증 정보 (JSON 형식) 또는 None (실패 시).
     """
-    if not openai_api_key:
-        print("❗ DEBUG: [receipt_analyzer.py] OpenAI API Key가 함수 인자로 전달되지 않았습니다.")
+    client = client or get_async_openai_client()
+    if client is None:
+        print("❗ DEBUG: [receipt_analyzer.py] OpenAI 클라이언트를 사용할 수 없습니다. OPENAI_API_KEY 설정을 확인하세요.")
         return None
 
-    client = openai.OpenAI(api_key=openai_api_key) # openai_api_key 인자 사용
-
     prompt = f"""
     다음은 영수증에서 OCR로 추출된 텍스트입니다.
     이 텍스트에서 다음 정보를 추출하여 **반드시 JSON 형식으로** 반환해주세요.
@@ -142,7 +225,7 @@ def extract_receipt_info_with_gpt(ocr_text_content: str, openai_api_key: str) ->
     """
 
     try:
-        response = client.chat.completions.create(
+        response = await client.chat.completions.create(
             model="gpt-4o", # 더 정확한 결과를 위해 gpt-4o 또는 gpt-4를 권장합니다.
             messages=[
                 {"role": "system", "content": "You are a highly accurate assistant specialized in extracting structured information from receipt texts. Always respond in JSON format."},
@@ -191,7 +274,9 @@ if __name__ == "__main__":
 
     print(f"📤 이미지 '{sample_image_path}'에서 OCR 텍스트 추출 중...")
     # 수정된 함수 시그니처에 맞게 인자 전달
-    ocr_result_json = call_clova_ocr(sample_image_path, local_clova_ocr_url, local_clova_ocr_secret)
+    with open(sample_image_path, 'rb') as f:
+        sample_image_bytes = f.read()
+    ocr_result_json = asyncio.run(call_clova_ocr(sample_image_bytes, local_clova_ocr_url, local_clova_ocr_secret))
 
     if ocr_result_json:
         ocr_full_text = extract_texts_from_clova(ocr_result_json)
@@ -199,7 +284,7 @@ if __name__ == "__main__":
 
         print("\n✨ OpenAI GPT로 영수증 정보 추출 중...")
         # 수정된 함수 시그니처에 맞게 인자 전달
-        receipt_info = extract_receipt_info_with_gpt(ocr_full_text, local_openai_api_key)
+        receipt_info = asyncio.run(extract_receipt_info_with_gpt(ocr_full_text))
 
         if receipt_info:
             print("\n✅ 최종 추출된 영수증 정보:")
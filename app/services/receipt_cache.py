@@ -0,0 +1,43 @@
+"""
+영수증 분석 결과 캐시 (2단계).
+1단계: 이미지 바이트 해시 - 같은 사진을 다시 스캔하거나 업로드를 재시도하면 OCR과 GPT 호출을 모두 생략합니다.
+2단계: 정규화된 OCR 텍스트 해시 - 같은 영수증을 다시 찍어 바이트가 달라도 OCR 결과가 같으면 GPT 호출을 생략합니다.
+       흐리거나 빈 사진은 OCR 텍스트가 거의 없어 서로 같은 키가 되므로 2단계 캐시를 사용하지 않습니다.
+"""
+
+from app.core.cache import SQLiteCache, content_hash
+from app.core.config import RECEIPT_CACHE_TTL_SECONDS, RECEIPT_CACHE_MAX_ENTRIES, RECEIPT_TEXT_CACHE_MIN_CHARS
+from app.utils.text_utils import normalize_text
+
+# 이미지 바이트의 SHA-256 해시 → receipt_info
+receipt_image_cache = SQLiteCache(
+    namespace="receipt_image",
+    ttl_seconds=RECEIPT_CACHE_TTL_SECONDS,
+    max_entries=RECEIPT_CACHE_MAX_ENTRIES,
+)
+
+# 정규화된 OCR 텍스트의 SHA-256 해시 → receipt_info
+receipt_text_cache = SQLiteCache(
+    namespace="receipt_ocr_text",
+    ttl_seconds=RECEIPT_CACHE_TTL_SECONDS,
+    max_entries=RECEIPT_CACHE_MAX_ENTRIES,
+)
+
+
+def ocr_text_key(text: str) -> str | None:
+    """
+    정규화된 OCR 텍스트(유니코드 통일, 대소문자 무시, 공백 축약)로 2단계 캐시 키 생성
+    텍스트가 RECEIPT_TEXT_CACHE_MIN_CHARS보다 짧으면 (인식 실패한 사진) None
+    """
+    normalized = normalize_text(text)
+    if len(normalized) < max(1, RECEIPT_TEXT_CACHE_MIN_CHARS):
+        return None
+    return content_hash(normalized.encode("utf-8"))
+
+
+def receipt_cache_stats() -> dict:
+    """영수증 캐시 단계별 적중/미스 통계"""
+    return {
+        "image": receipt_image_cache.stats(),
+        "ocr_text": receipt_text_cache.stats(),
+    }
@@ -0,0 +1,180 @@
+"""
+영수증 분석 파이프라인.
+이미지 해시 캐시 → 클로바 OCR → OCR 텍스트 캐시 → GPT 정보 추출 순서로 진행하며,
+단건(/analyze-receipt/)과 일괄(/analyze-receipts/batch) 엔드포인트가 함께 사용합니다.
+"""
+
+import asyncio
+from typing import AsyncIterator, BinaryIO
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import content_hash
+from app.core.workers import run_in_image_pool
+from app.core.config import CLOVA_OCR_MAX_IMAGES_PER_REQUEST, RECEIPT_PREPROCESS_ENABLED
+from app.services.receipt_analyzer import (
+    call_clova_ocr,
+    call_clova_ocr_multi,
+    extract_texts_from_clova,
+    extract_receipt_info_with_gpt,
+)
+from app.services.receipt_cache import receipt_image_cache, receipt_text_cache, ocr_text_key
+from app.utils.image_utils import preprocess_receipt_image
+
+OCR_FAILED_ERROR = "영수증 OCR 처리 중 오류가 발생했습니다."
+
+
+def _read_all(image: BinaryIO) -> bytes:
+    image.seek(0)
+    return image.read()
+
+
+async def _prepare_for_ocr(image: bytes | BinaryIO, image_format: str) -> tuple[bytes | BinaryIO, str]:
+    """OCR 전송량을 줄이기 위한 전처리 (설정으로 끌 수 있음)"""
+    if not RECEIPT_PREPROCESS_ENABLED:
+        return image, image_format
+    if not isinstance(image, bytes):
+        image = await run_in_threadpool(_read_all, image)
+    return await run_in_image_pool(preprocess_receipt_image, image, image_format)
+
+
+async def _lookup_image_cache(image_hash: str) -> dict | None:
+    """같은 이미지는 이전 분석 결과를 그대로 반환 (OCR + GPT 호출 생략)"""
+    cached_info = await receipt_image_cache.aget(image_hash)
+    if cached_info is not None:
+        print(f"INFO: 영수증 캐시 적중: {image_hash[:12]}")
+        return {"success": True, "receipt_info": cached_info, "cache": "image"}
+    return None
+
+
+async def _structure_ocr_result(image_hash: str, ocr_result: dict) -> dict:
+    """OCR 결과에서 텍스트를 뽑아 GPT로 영수증 정보를 구조화하고 캐시에 저장"""
+    ocr_text = extract_texts_from_clova(ocr_result)
+    print("INFO: OCR 텍스트 추출 완료.")
+
+    # 다른 사진이라도 OCR 텍스트가 같은 영수증이면 GPT 호출 생략 (텍스트가 거의 없으면 키가 없어 건너뜀)
+    text_key = ocr_text_key(ocr_text)
+    cached_info = await receipt_text_cache.aget(text_key) if text_key is not None else None
+    if cached_info is not None:
+        print(f"INFO: 영수증 OCR 텍스트 캐시 적중: {text_key[:12]}")
+        await receipt_image_cache.aset(image_hash, cached_info)
+        return {"success": True, "receipt_info": cached_info, "cache": "ocr_text"}
+
+    print("INFO: OpenAI GPT로 영수증 정보 추출 중...")
+    receipt_info = await extract_receipt_info_with_gpt(ocr_text)
+
+    if not receipt_info:
+        print("ERROR: GPT를 통한 영수증 정보 추출 실패.")
+        return {"success": False, "error": "영수증 정보 추출 중 오류가 발생했습니다. (GPT 응답 문제)"}
+
+    print("INFO: 영수증 정보 추출 완료.")
+    await receipt_image_cache.aset(image_hash, receipt_info)
+    if text_key is not None:
+        await receipt_text_cache.aset(text_key, receipt_info)
+
+    return {"success": True, "receipt_info": receipt_info, "cache": None}
+
+
+async def analyze_receipt_image(
+    image: bytes | BinaryIO, api_url: str, secret_key: str, image_format: str = "jpg"
+) -> dict:
+    """
+    영수증 이미지 한 장을 분석합니다.
+
+    Returns:
+        dict: 성공 시 {"success": True, "receipt_info": ..., "cache": "image" | "ocr_text" | None},
+              실패 시 {"success": False, "error": ...}
+    """
+    image_hash = await run_in_threadpool(content_hash, image)
+    cached = await _lookup_image_cache(image_hash)
+    if cached is not None:
+        return cached
+
+    image, image_format = await _prepare_for_ocr(image, image_format)
+
+    print("INFO: 클로바 OCR API 호출 중...")
+    ocr_result = await call_clova_ocr(image, api_url, secret_key, image_format)
+
+    if not ocr_result:
+        print("ERROR: OCR 처리 중 오류 발생: 클로바 OCR 응답 없음 또는 오류 발생.")
+        return {"success": False, "error": OCR_FAILED_ERROR}
+
+    return await _structure_ocr_result(image_hash, ocr_result)
+
+
+async def analyze_receipt_images(
+    images: list[tuple[bytes, str]], api_url: str, secret_key: str, concurrency: int
+) -> AsyncIterator[tuple[int, dict]]:
+    """
+    여러 영수증 이미지((내용, 형식) 목록)를 분석하고, 끝나는 순서대로 (입력 순번, 결과)를 내보냅니다.
+    같은 이미지(바이트 해시 기준)는 한 번만 분석하며,
+    캐시에 없는 이미지는 CLOVA_OCR_MAX_IMAGES_PER_REQUEST장씩 묶어 OCR을 요청하고,
+    OCR 요청과 GPT 호출은 각각 최대 concurrency개까지 동시에 진행합니다.
+    """
+    ocr_semaphore = asyncio.Semaphore(max(1, concurrency))
+    gpt_semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: asyncio.Queue[tuple[int, dict]] = asyncio.Queue()
+
+    def internal_error(e: Exception) -> dict:
+        print(f"ERROR: 영수증 일괄 분석 중 오류 발생: {e}")
+        return {"success": False, "error": f"서버 내부 오류 발생: {type(e).__name__}"}
+
+    async def structure(index: int, image_hash: str, ocr_result: dict | None) -> None:
+        if not ocr_result:
+            await results.put((index, {"success": False, "error": OCR_FAILED_ERROR}))
+            return
+        try:
+            async with gpt_semaphore:
+                result = await _structure_ocr_result(image_hash, ocr_result)
+        except Exception as e:
+            result = internal_error(e)
+        await results.put((index, result))
+
+    async def run_chunk(chunk: list[tuple[int, str]]) -> None:
+        try:
+            prepared = await asyncio.gather(*(_prepare_for_ocr(*images[index]) for index, _ in chunk))
+            async with ocr_semaphore:
+                print(f"INFO: 클로바 OCR API 호출 중... (이미지 {len(chunk)}장)")
+                ocr_results = await call_clova_ocr_multi(list(prepared), api_url, secret_key)
+        except Exception as e:
+            error = internal_error(e)
+            for index, _ in chunk:
+                await results.put((index, error))
+            return
+
+        # 묶음 응답을 이미지별로 나눠 각자 GPT 단계로 넘김
+        await asyncio.gather(*(
+            structure(index, image_hash, ocr_result)
+            for (index, image_hash), ocr_result in zip(chunk, ocr_results)
+        ))
+
+    hashes = [await run_in_threadpool(content_hash, content) for content, _ in images]
+
+    # 같은 이미지가 여러 번 들어 있으면 한 번만 분석하고 결과를 같은 해시의 모든 순번에 돌려줌
+    indexes_by_hash: dict[str, list[int]] = {}
+    for index, image_hash in enumerate(hashes):
+        indexes_by_hash.setdefault(image_hash, []).append(index)
+
+    misses = []  # (해시별 첫 순번, 해시)
+    for image_hash, indexes in indexes_by_hash.items():
+        cached = await _lookup_image_cache(image_hash)
+        if cached is not None:
+            for index in indexes:
+                yield index, cached
+        else:
+            misses.append((indexes[0], image_hash))
+
+    chunk_size = max(1, CLOVA_OCR_MAX_IMAGES_PER_REQUEST)
+    tasks = [
+        asyncio.create_task(run_chunk(misses[start:start + chunk_size]))
+        for start in range(0, len(misses), chunk_size)
+    ]
+    try:
+        for _ in misses:
+            index, result = await results.get()
+            for same_image_index in indexes_by_hash[hashes[index]]:
+                yield same_image_index, result
+    finally:
+        # 클라이언트 연결이 끊기면 남은 작업 취소
+        for task in tasks:
+            task.cancel()
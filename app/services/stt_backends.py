@@ -0,0 +1,133 @@
+"""
+로컬 STT 엔진 (Whisper fallback).
+엔진은 앱 시작 시 STT_LOCAL_BACKENDS 순서대로 한 번 불러오며, 인식은 음성 조각(16kHz 모노 PCM) 단위로 수행합니다.
+앞 엔진이 사용할 수 없거나 서비스 오류를 내면 다음 엔진으로 넘어갑니다.
+"""
+
+import json
+import os
+from abc import ABC, abstractmethod
+
+from app.core.config import STT_LOCAL_BACKENDS, STT_VOSK_MODEL_PATH
+
+try:
+    import vosk  # type: ignore
+    VOSK_AVAILABLE = True
+except ImportError:
+    VOSK_AVAILABLE = False
+
+_backends: "list[LocalSTTBackend] | None" = None
+
+
+class STTBackendError(Exception):
+    """엔진 자체를 사용할 수 없는 오류 (네트워크, 모델 등) - 다음 엔진으로 넘어감"""
+
+
+class LocalSTTBackend(ABC):
+    """로컬 STT 엔진 인터페이스"""
+
+    name = "base"
+
+    def load(self) -> bool:
+        """엔진 준비 (앱 시작 시 한 번 호출). 사용할 수 없으면 False"""
+        return True
+
+    @abstractmethod
+    def recognize(self, segment) -> str:
+        """pydub AudioSegment(16kHz 모노) 하나를 인식. 말소리가 없으면 빈 문자열, 엔진 오류는 STTBackendError"""
+
+
+class VoskSTTBackend(LocalSTTBackend):
+    """Vosk(Kaldi) 오프라인 엔진 - 프로세스 안에서 CPU로 인식하므로 외부 네트워크를 사용하지 않음"""
+
+    name = "vosk"
+
+    def __init__(self, model_path: str = STT_VOSK_MODEL_PATH):
+        self.model_path = model_path
+        self._model = None
+
+    def load(self) -> bool:
+        if not VOSK_AVAILABLE:
+            print("경고: vosk 패키지가 설치되지 않아 오프라인 STT 엔진을 사용할 수 없습니다.")
+            return False
+        if not self.model_path or not os.path.isdir(self.model_path):
+            print(f"경고: Vosk 모델 경로가 올바르지 않습니다: '{self.model_path}' (STT_VOSK_MODEL_PATH)")
+            return False
+        vosk.SetLogLevel(-1)
+        self._model = vosk.Model(self.model_path)
+        return True
+
+    def recognize(self, segment) -> str:
+        # 인식기는 상태를 가지므로 조각마다 새로 만들고, 모델은 공유
+        try:
+            recognizer = vosk.KaldiRecognizer(self._model, segment.frame_rate)
+            recognizer.AcceptWaveform(segment.set_sample_width(2).raw_data)
+            return json.loads(recognizer.FinalResult()).get("text", "").strip()
+        except Exception as e:
+            # Kaldi/모델 오류로 이 엔진을 쓸 수 없으면 다음 엔진(Google 등)으로 넘어가도록 감쌈
+            raise STTBackendError(f"Vosk 인식 오류: {e}") from e
+
+
+class GoogleSTTBackend(LocalSTTBackend):
+    """SpeechRecognition의 Google Web Speech API (네트워크 필요)"""
+
+    name = "google"
+
+    def load(self) -> bool:
+        try:
+            import speech_recognition  # noqa: F401
+        except ImportError:
+            print("경고: speech_recognition 패키지가 설치되지 않아 Google STT 엔진을 사용할 수 없습니다.")
+            return False
+        return True
+
+    def recognize(self, segment) -> str:
+        import speech_recognition as sr
+
+        recognizer = sr.Recognizer()
+        # PCM을 그대로 전달하므로 파일을 만들지 않음
+        audio_data = sr.AudioData(segment.raw_data, segment.frame_rate, segment.sample_width)
+        try:
+            return recognizer.recognize_google(audio_data, language="ko-KR")
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise STTBackendError(f"음성 인식 서비스 오류: {e}") from e
+
+
+BACKEND_CLASSES = {
+    VoskSTTBackend.name: VoskSTTBackend,
+    GoogleSTTBackend.name: GoogleSTTBackend,
+}
+
+
+def init_stt_backends() -> list[LocalSTTBackend]:
+    """STT_LOCAL_BACKENDS 순서대로 엔진을 불러옴 (앱 시작 시 호출, 모델 로딩은 여기서 한 번만)"""
+    global _backends
+    backends = []
+    for name in STT_LOCAL_BACKENDS:
+        backend_class = BACKEND_CLASSES.get(name)
+        if backend_class is None:
+            print(f"경고: 알 수 없는 로컬 STT 엔진입니다: {name}")
+            continue
+        backend = backend_class()
+        try:
+            loaded = backend.load()
+        except Exception as e:
+            print(f"경고: 로컬 STT 엔진 로드 실패 ({name}): {e}")
+            loaded = False
+        if loaded:
+            backends.append(backend)
+    _backends = backends
+    print(f"로컬 STT 엔진 준비 완료: {', '.join(backend.name for backend in backends) or '없음'}")
+    if [backend.name for backend in backends] == [GoogleSTTBackend.name]:
+        print("경고: 오프라인 STT 엔진 없이 Google 음성 인식(외부 네트워크)만 사용합니다. "
+              "vosk 설치와 STT_VOSK_MODEL_PATH 설정은 DEPLOYMENT.md를 참고하세요.")
+    return backends
+
+
+def get_stt_backends() -> list[LocalSTTBackend]:
+    """사용 가능한 로컬 STT 엔진 목록 (앱 lifecycle 밖에서 호출되면 지연 로드)"""
+    if _backends is None:
+        return init_stt_backends()
+    return _backends
@@ -0,0 +1,63 @@
+"""
+STT 전사 결과 캐시.
+컨테이너 바이트가 아니라 16kHz 모노로 디코딩한 PCM의 해시를 키로 사용하므로,
+같은 인코딩 스트림을 다른 컨테이너나 샘플 배치(채널 수/샘플레이트/비트 깊이)로 다시 보내도 Whisper 호출을 생략합니다.
+AAC와 WAV처럼 손실 압축으로 다시 인코딩한 파일은 디코딩 결과 PCM이 달라지므로 같은 키가 되지 않습니다.
+디코딩할 수 없는 형식(ffmpeg 없음)은 파일 바이트 해시로 대신합니다.
+"""
+
+import threading
+
+from app.core.cache import MemoryCache, SQLiteCache
+from app.core.config import (
+    STT_CACHE_TTL_SECONDS,
+    STT_CACHE_MAX_ENTRIES,
+    STT_CACHE_PERSIST,
+    WHISPER_COST_PER_MINUTE,
+)
+
+# 오디오 지문 → {"text": 전사 결과, "billed_seconds": Whisper 과금 기준 길이}
+# STT_CACHE_PERSIST=true면 seein.db에 저장하여 재시작 후에도 유지
+_cache_class = SQLiteCache if STT_CACHE_PERSIST else MemoryCache
+transcription_cache = _cache_class(
+    namespace="stt_transcription",
+    ttl_seconds=STT_CACHE_TTL_SECONDS,
+    max_entries=STT_CACHE_MAX_ENTRIES,
+)
+
+_savings_lock = threading.Lock()
+_seconds_avoided = 0.0
+
+
+async def get_cached_transcription(fingerprint: str | None) -> str | None:
+    """캐시된 전사 결과 반환 (적중 시 생략한 Whisper 과금 시간을 누적)"""
+    global _seconds_avoided
+    if fingerprint is None:
+        return None
+    cached = await transcription_cache.aget(fingerprint)
+    if cached is None:
+        return None
+
+    billed_seconds = cached.get("billed_seconds") or 0.0
+    with _savings_lock:
+        _seconds_avoided += billed_seconds
+    print(f"[STT 캐시 적중] {fingerprint[:16]} (Whisper {billed_seconds}초 생략)")
+    return cached["text"]
+
+
+async def cache_transcription(fingerprint: str | None, text: str, billed_seconds: float | None) -> None:
+    """Whisper 전사 결과 저장 (빈 결과는 저장하지 않음)"""
+    if fingerprint is None or not text:
+        return
+    await transcription_cache.aset(fingerprint, {"text": text, "billed_seconds": billed_seconds})
+
+
+def stt_cache_stats() -> dict:
+    """전사 캐시 적중/미스 통계와 생략한 Whisper 사용량(추정 비용) 반환"""
+    with _savings_lock:
+        seconds_avoided = _seconds_avoided
+    return {
+        **transcription_cache.stats(),
+        "whisper_seconds_avoided": round(seconds_avoided, 2),
+        "estimated_cost_avoided_usd": round(seconds_avoided / 60 * WHISPER_COST_PER_MINUTE, 4),
+    }
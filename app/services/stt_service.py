@@ -1,8 +1,9 @@
 # app/services/stt_service.py
+import asyncio
 import os
 from dotenv import load_dotenv
-from tempfile import NamedTemporaryFile
 from typing import BinaryIO
+from starlette.concurrency import run_in_threadpool
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -12,14 +13,33 @@ print(f"OpenAI API Key loaded: {'Yes' if OPENAI_API_KEY else 'No'}")
 if OPENAI_API_KEY:
     print(f"API Key prefix: {OPENAI_API_KEY[:10]}...")
 
-# OpenAI SDK v1
-from openai import OpenAI
-client = None
+# OpenAI SDK v1 - 앱 공용 클라이언트 사용
+from openai import AsyncOpenAI
+from app.core.audio import get_audio_capabilities
+from app.core.clients import get_async_openai_client
+from app.core.config import (
+    STT_NORMALIZE_ENABLED,
+    STT_NORMALIZE_FORMAT,
+    STT_NORMALIZE_SAMPLE_RATE,
+    STT_NORMALIZE_MIN_BYTES,
+    STT_CHUNKING_ENABLED,
+    STT_CHUNK_CONCURRENCY,
+    STT_CACHE_ENABLED,
+)
+from app.core.cache import content_hash
+from app.core.workers import run_in_audio_pool
+from app.services.stt_backends import LocalSTTBackend, STTBackendError, get_stt_backends
+from app.services.stt_cache import get_cached_transcription, cache_transcription
+from app.utils.audio_utils import (
+    NORMALIZE_FORMATS,
+    decode_audio_for_stt,
+    encode_audio_for_stt,
+    speech_segments,
+    log_audio_normalize_stats,
+)
+from app.utils.text_utils import stitch_transcripts
 
-if OPENAI_API_KEY:
-    client = OpenAI(api_key=OPENAI_API_KEY)
-    print("OpenAI client initialized successfully")
-else:
+if not OPENAI_API_KEY:
     print("Warning: OPENAI_API_KEY가 설정되지 않았습니다. STT 기능을 사용하려면 .env 파일에 API 키를 설정하세요.")
 
 # 모든 오디오 형식 지원 (OpenAI Whisper가 직접 처리)
@@ -28,111 +48,181 @@ ALLOWED_EXTS = {".wav", ".mp3", ".m4a", ".ogg", ".webm", ".flac", ".aac"}
 def _ext(path: str) -> str:
     return os.path.splitext(path)[1].lower()
 
-def transcribe_with_local_stt(file_content: bytes, filename: str) -> str:
+def _load_local_segments(file_content: bytes, filename: str) -> list | str:
+    """
+    로컬 STT용으로 오디오를 불러와 16kHz 모노 음성 조각 목록으로 나눔 (실패 시 오류 메시지 문자열)
+    조각은 (AudioSegment, 앞 조각과 겹치게 잘렸는지 여부) 쌍
+    """
+    from pydub import AudioSegment
+    from io import BytesIO
+
+    # ffmpeg 탐색은 앱 시작 시 한 번만 수행 (요청마다 서브프로세스를 띄우지 않음)
+    capabilities = get_audio_capabilities()
+    ffmpeg_available = capabilities.ffmpeg_available
+    file_ext = _ext(filename)
+
+    print(f"파일 확장자: {file_ext}")
+    print(f"파일 크기: {len(file_content)} bytes")
+    print(f"ffmpeg 사용 가능: {ffmpeg_available}")
+
+    if not capabilities.can_decode(file_ext):
+        return f"오디오 파일 변환 오류: 이 오디오 형식({file_ext})을 처리하려면 ffmpeg가 필요합니다. https://ffmpeg.org/download.html 에서 다운로드하거나, WAV 또는 MP3 형식으로 변환 후 다시 시도해보세요."
+
+    try:
+        audio = AudioSegment.from_file(BytesIO(file_content), format=file_ext.lstrip("."))
+        print("오디오 파일 로드 성공")
+    except Exception as audio_error:
+        # MP3와 WAV는 ffmpeg 없이도 처리 가능해야 함
+        if file_ext in ['.mp3', '.wav'] and not ffmpeg_available:
+            return f"오디오 파일 변환 오류: {audio_error}. MP3/WAV 파일인데도 변환에 실패했습니다. 파일이 손상되었거나 지원되지 않는 코덱일 수 있습니다."
+        elif not ffmpeg_available:
+            return f"오디오 파일 변환 오류: {audio_error}. 이 오디오 형식({file_ext})을 처리하려면 ffmpeg가 필요합니다. https://ffmpeg.org/download.html 에서 다운로드하거나, WAV 또는 MP3 형식으로 변환 후 다시 시도해보세요."
+        else:
+            return f"오디오 파일 변환 오류: {audio_error}"
+
+    # 파일 전체를 한 번에 인식하지 않고 무음을 걷어낸 음성 조각 단위로 인식
+    return speech_segments(audio.set_channels(1).set_frame_rate(STT_NORMALIZE_SAMPLE_RATE))
+
+
+async def transcribe_with_local_stt(file_content: bytes, filename: str) -> str:
     """
     로컬 STT를 사용한 음성 인식 (OpenAI API 대체)
+    음성 조각을 동시에 인식한 뒤 순서대로 이어 붙이며, 엔진은 STT_LOCAL_BACKENDS 순서대로 시도
+    (블로킹 작업은 워커 풀/스레드풀에서 실행)
     """
     try:
-        import speech_recognition as sr
-        from pydub import AudioSegment
-        from io import BytesIO
-        
-        # pydub이 ffmpeg를 찾을 수 있도록 환경 변수 설정
-        import os
-        
-        # 여러 가능한 ffmpeg 경로들 (Windows 전용)
-        possible_ffmpeg_paths = [
-            'C:\\ffmpeg-7.1.1-essentials_build\\bin',  # 로컬 개발 환경
-            'C:\\ffmpeg\\bin',                         # 일반적인 설치 경로
-            'C:\\Program Files\\ffmpeg\\bin',          # Program Files 설치 경로
-            'C:\\Program Files (x86)\\ffmpeg\\bin',    # Program Files (x86) 설치 경로
-        ]
-        
-        # PATH에 ffmpeg 경로 추가
-        if 'PATH' not in os.environ:
-            os.environ['PATH'] = ''
-        
-        for ffmpeg_path in possible_ffmpeg_paths:
-            if os.path.exists(ffmpeg_path) and ffmpeg_path not in os.environ['PATH']:
-                os.environ['PATH'] = ffmpeg_path + os.pathsep + os.environ['PATH']
-                print(f"ffmpeg 경로 추가됨: {ffmpeg_path}")
-                break
-        
-        # ffmpeg 설치 확인 (선택적)
-        ffmpeg_available = False
-        try:
-            import subprocess
-            # 먼저 PATH에서 ffmpeg 찾기 시도
-            result = subprocess.run(['ffmpeg', '-version'], capture_output=True, text=True)
-            ffmpeg_available = result.returncode == 0
-        except FileNotFoundError:
-            # PATH에서 찾을 수 없으면 직접 경로 시도
+        backends = get_stt_backends()
+        if not backends:
+            return "로컬 STT 오류: 사용할 수 있는 로컬 STT 엔진이 없습니다."
+
+        segments = await run_in_audio_pool(_load_local_segments, file_content, filename)
+        if isinstance(segments, str):
+            return segments
+
+        semaphore = asyncio.Semaphore(max(1, STT_CHUNK_CONCURRENCY))
+
+        async def recognize(backend: LocalSTTBackend, segment) -> str:
+            async with semaphore:
+                return await run_in_threadpool(backend.recognize, segment)
+
+        last_error = None
+        for backend in backends:
             try:
-                result = subprocess.run(['C:\\ffmpeg-7.1.1-essentials_build\\bin\\ffmpeg.exe', '-version'], capture_output=True, text=True)
-                ffmpeg_available = result.returncode == 0
-                if ffmpeg_available:
-                    print("ffmpeg를 직접 경로에서 찾았습니다.")
-            except FileNotFoundError:
-                ffmpeg_available = False
-        
-        if not ffmpeg_available:
-            print("경고: ffmpeg가 설치되지 않았습니다. 일부 오디오 형식에서 문제가 발생할 수 있습니다.")
-            
-        # 오디오 파일을 WAV로 변환
-        print(f"파일 확장자: {os.path.splitext(filename)[1].lower()}")
-        print(f"파일 크기: {len(file_content)} bytes")
-        print(f"ffmpeg 사용 가능: {ffmpeg_available}")
-        
-        try:
-            audio = AudioSegment.from_file(BytesIO(file_content))
-            print("오디오 파일 로드 성공")
-        except Exception as audio_error:
-            # 파일 확장자 확인
-            file_ext = os.path.splitext(filename)[1].lower()
-            
-            # MP3와 WAV는 ffmpeg 없이도 처리 가능해야 함
-            if file_ext in ['.mp3', '.wav'] and not ffmpeg_available:
-                return f"오디오 파일 변환 오류: {audio_error}. MP3/WAV 파일인데도 변환에 실패했습니다. 파일이 손상되었거나 지원되지 않는 코덱일 수 있습니다."
-            elif not ffmpeg_available:
-                return f"오디오 파일 변환 오류: {audio_error}. 이 오디오 형식({file_ext})을 처리하려면 ffmpeg가 필요합니다. https://ffmpeg.org/download.html 에서 다운로드하거나, WAV 또는 MP3 형식으로 변환 후 다시 시도해보세요."
-            else:
-                return f"오디오 파일 변환 오류: {audio_error}"
-        
-        # 임시 WAV 파일 생성
-        temp_path = None
-        try:
-            with NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                audio.export(temp_file.name, format="wav")
-                temp_path = temp_file.name
-            
-            # SpeechRecognition 사용
-            recognizer = sr.Recognizer()
-            with sr.AudioFile(temp_path) as source:
-                audio_data = recognizer.record(source)
-                # Google Speech Recognition 사용 (무료)
-                text = recognizer.recognize_google(audio_data, language="ko-KR")
-                return text
-        except sr.UnknownValueError:
-            return "음성을 인식할 수 없습니다."
-        except sr.RequestError as e:
-            return f"음성 인식 서비스 오류: {e}"
-        except Exception as e:
-            return f"음성 인식 처리 오류: {e}"
-        finally:
-            # 임시 파일 정리
-            if temp_path:
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+                texts = await asyncio.gather(*(recognize(backend, segment) for segment, _ in segments))
+            except STTBackendError as e:
+                print(f"로컬 STT 엔진 오류 ({backend.name}), 다음 엔진 시도: {e}")
+                last_error = str(e)
+                continue
+            except Exception as e:
+                return f"음성 인식 처리 오류: {e}"
+
+            print(f"로컬 STT 엔진 사용: {backend.name}")
+            text = stitch_transcripts(texts, [overlapped for _, overlapped in segments])
+            return text or "음성을 인식할 수 없습니다."
+
+        return last_error
     except Exception as e:
         return f"로컬 STT 오류: {e}"
 
-def transcribe_audio(file_content: bytes, filename: str) -> str:
+
+def _should_prepare(file_content: bytes) -> bool:
+    """업로드 전 변환(다운믹스/무음 제거/분할)을 할지 여부 - 작은 파일은 변환 비용이 더 큼"""
+    return (STT_NORMALIZE_ENABLED or STT_CHUNKING_ENABLED) and len(file_content) >= STT_NORMALIZE_MIN_BYTES
+
+
+async def _decode_for_upload(file_content: bytes, filename: str) -> tuple | None:
+    """
+    16kHz 모노 PCM으로 한 번만 디코딩 (오디오 워커 풀에서 실행)
+    디코딩할 수 없는 형식이거나 실패하면 None
+
+    Returns:
+        tuple: (정규화된 AudioSegment, fingerprint 등 decode 통계)
+    """
+    ext = _ext(filename)
+    if not get_audio_capabilities().can_decode(ext):
+        return None
+    try:
+        return await run_in_audio_pool(decode_audio_for_stt, file_content, ext)
+    except Exception as e:
+        print(f"경고: 오디오 디코딩 실패, 원본을 전송합니다: {e}")
+        return None
+
+
+async def prepare_for_upload(
+    decoded: tuple | None, file_content: bytes, filename: str
+) -> tuple[list[tuple[bytes, str]], dict | None]:
+    """
+    Whisper 업로드 전 다운믹스된 오디오를 무음 제거 + 음성 조각 분할 + 재인코딩 (오디오 워커 풀에서 실행)
+    설정이 꺼져 있거나, 파일이 작거나, 디코딩할 수 없거나, 변환에 실패하면 원본 한 개를 그대로 반환
+    소리가 전혀 없으면 빈 목록을 반환
+
+    Returns:
+        tuple: ([(오디오 바이트, 파일명), ...] 재생 순서대로, 변환 통계 또는 None(원본 그대로))
+    """
+    original = [(file_content, filename)], None
+    if decoded is None or not _should_prepare(file_content):
+        return original
+
+    # 인코더가 없으면 조각은 WAV로 전송
+    target_format = STT_NORMALIZE_FORMAT if STT_NORMALIZE_ENABLED else "wav"
+    target = NORMALIZE_FORMATS.get(target_format)
+    if target is None:
+        print(f"경고: 지원하지 않는 STT_NORMALIZE_FORMAT입니다: {target_format}")
+        return original
+    if target[1] is not None and not get_audio_capabilities().can_encode(target[1]):
+        if not STT_CHUNKING_ENABLED:
+            return original
+        target_format = "wav"
+
+    normalized, decode_stats = decoded
+    try:
+        parts, stats = await run_in_audio_pool(
+            encode_audio_for_stt, normalized, file_content, decode_stats, target_format, chunk=STT_CHUNKING_ENABLED
+        )
+    except Exception as e:
+        print(f"경고: 오디오 정규화 실패, 원본을 전송합니다: {e}")
+        return original
+
+    log_audio_normalize_stats(stats)
+    base = os.path.splitext(os.path.basename(filename))[0]
+    if len(parts) == 1:
+        return [(parts[0][0], base + parts[0][1])], stats
+    return [(data, f"{base}_{index:03d}{part_ext}") for index, (data, part_ext) in enumerate(parts)], stats
+
+
+async def _transcribe_with_whisper(
+    client: AsyncOpenAI, parts: list[tuple[bytes, str]], overlaps: list[bool] | None = None
+) -> str:
+    """
+    음성 조각을 최대 STT_CHUNK_CONCURRENCY개씩 동시에 Whisper로 전사하고 순서대로 이어 붙임
+    overlaps는 조각별로 앞 조각과 겹치게 잘렸는지 여부 (겹친 경계에서만 중복 단어 제거)
+    """
+    semaphore = asyncio.Semaphore(max(1, STT_CHUNK_CONCURRENCY))
+
+    async def transcribe_part(content: bytes, name: str) -> str:
+        async with semaphore:
+            # OpenAI Whisper Transcriptions - (파일명, 바이트) 그대로 전송 (파일명으로 형식 판별)
+            result = await client.audio.transcriptions.create(
+                model="whisper-1",
+                file=(os.path.basename(name), content),
+                # language="ko",  # 한국어 고정 원하면 주석 해제
+                response_format="json"
+            )
+            return result.text.strip()
+
+    texts = await asyncio.gather(*(transcribe_part(content, name) for content, name in parts))
+    return stitch_transcripts(list(texts), overlaps)
+
+
+async def transcribe_audio(file_content: bytes, filename: str, client: AsyncOpenAI | None = None) -> str:
     """
     오디오 파일을 받아 Whisper API로 전사하고 텍스트 반환
+    업로드 내용은 메모리에서 바로 비동기 클라이언트로 전송하며 임시 파일을 만들지 않음
+    긴 오디오는 무음을 걷어낸 음성 조각으로 나눠 동시에 전사하므로 지연 시간이 가장 긴 조각 기준으로 결정됨
     OpenAI API 할당량 초과 시 로컬 STT로 fallback
     """
+    client = client or get_async_openai_client()
+
     # 파일 확장자 확인
     ext = _ext(filename)
     if ext not in ALLOWED_EXTS:
@@ -141,44 +231,45 @@ def transcribe_audio(file_content: bytes, filename: str) -> str:
     # OpenAI API 사용 시도
     if client:
         try:
-            # 임시 파일 생성 (원본 형식 유지)
-            with NamedTemporaryFile(suffix=ext, delete=False) as temp_file:
-                temp_file.write(file_content)
-                temp_file.flush()
-                temp_path = temp_file.name
-            
-            try:
-                with open(temp_path, "rb") as f:
-                    # OpenAI Whisper Transcriptions - 원본 형식 그대로 전송
-                    result = client.audio.transcriptions.create(
-                        model="whisper-1",
-                        file=f,
-                        # language="ko",  # 한국어 고정 원하면 주석 해제
-                        response_format="json"
-                    )
-                return result.text.strip()
-            except Exception as e:
-                error_msg = str(e)
-                if "insufficient_quota" in error_msg or "429" in error_msg:
-                    print("OpenAI API 할당량 초과, 로컬 STT로 fallback")
-                    return transcribe_with_local_stt(file_content, filename)
-                else:
-                    print(f"Whisper API 오류: {e}")
-                    # OpenAI API 오류 시에도 로컬 STT 시도
-                    local_result = transcribe_with_local_stt(file_content, filename)
-                    if "ffmpeg" in local_result or "오류" in local_result:
-                        return f"OpenAI API 오류: {e}. 로컬 STT도 사용할 수 없습니다. ffmpeg를 설치하거나 OpenAI API 키를 확인하세요."
-                    return local_result
-            finally:
-                # 임시 파일 정리
-                try:
-                    os.unlink(temp_path)
-                except:
-                    pass
+            # 16kHz 모노 PCM으로 한 번만 디코딩 (캐시 키 계산과 업로드 변환에 함께 사용)
+            decoded = None
+            if _should_prepare(file_content) or STT_CACHE_ENABLED:
+                decoded = await _decode_for_upload(file_content, filename)
+
+            # 같은 인코딩 스트림(컨테이너/샘플 배치가 달라도)을 이미 전사했다면 변환과 Whisper 호출 모두 생략
+            fingerprint = None
+            if STT_CACHE_ENABLED:
+                fingerprint = f"pcm:{decoded[1]['fingerprint']}" if decoded else f"raw:{content_hash(file_content)}"
+                cached = await get_cached_transcription(fingerprint)
+                if cached is not None:
+                    return cached
+
+            # 무음을 걷어내고 음성 조각으로 나눠 업로드 크기와 지연을 줄임
+            parts, stats = await prepare_for_upload(decoded, file_content, filename)
+            if not parts:
+                print("음성 구간 없음, 전사 생략")
+                return ""
+
+            transcription = await _transcribe_with_whisper(client, parts, stats["overlaps"] if stats else None)
+            if stats is not None:
+                billed_seconds = stats["speech_seconds"]
+            else:
+                billed_seconds = decoded[1]["duration_seconds"] if decoded else None
+            await cache_transcription(fingerprint, transcription, billed_seconds)
+            return transcription
         except Exception as e:
-            print(f"OpenAI API 오류: {e}")
-            return transcribe_with_local_stt(file_content, filename)
+            error_msg = str(e)
+            if "insufficient_quota" in error_msg or "429" in error_msg:
+                print("OpenAI API 할당량 초과, 로컬 STT로 fallback")
+                return await transcribe_with_local_stt(file_content, filename)
+            else:
+                print(f"Whisper API 오류: {e}")
+                # OpenAI API 오류 시에도 로컬 STT 시도
+                local_result = await transcribe_with_local_stt(file_content, filename)
+                if "ffmpeg" in local_result or "오류" in local_result:
+                    return f"OpenAI API 오류: {e}. 로컬 STT도 사용할 수 없습니다. ffmpeg를 설치하거나 OpenAI API 키를 확인하세요."
+                return local_result
     else:
         # OpenAI API 키가 없으면 로컬 STT 사용
         print("OpenAI API 키 없음, 로컬 STT 사용")
-        return transcribe_with_local_stt(file_content, filename)
+        return await transcribe_with_local_stt(file_content, filename)
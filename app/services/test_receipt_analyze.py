@@ -1,9 +1,11 @@
-import requests
+import httpx
 import uuid
 import time
 import json
 import openai
 
+from app.core.clients import get_ocr_client, get_async_openai_client
+
 async def call_clova(contents: bytes, secret_key: str, api_url: str):
     if contents == None:
         print("[call_clova] : 이미지 없음")
@@ -24,12 +26,12 @@ async def call_clova(contents: bytes, secret_key: str, api_url: str):
         payload = {'message': json.dumps(request_json)}
         files = [('file', contents)]
 
-        res = requests.post(api_url, headers=headers, data=payload, files=files)
+        res = await get_ocr_client().post(api_url, headers=headers, data=payload, files=files)
 
         print(f"응답 상태: {res.status_code}")
         print(f"텍스트 내용: {res.text}")
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"[call_clova] - CLOVA 호출 중 네트워크 에러: {e}")
         return None
     except json.JSONDecodeError as e:
@@ -57,13 +59,12 @@ def extract_text(clova_json):
 
     return ' '.join(texts)
 
-async def analyze_receipt(text_data: str, open_ai_key: str):
-    if not open_ai_key:
-        print("[analyze_receipt] : API KEY 전달 받지 못함")
+async def analyze_receipt(text_data: str, client: openai.AsyncOpenAI | None = None):
+    client = client or get_async_openai_client()
+    if client is None:
+        print("[analyze_receipt] : OpenAI 클라이언트 없음 (API KEY 확인)")
         return
 
-    client = openai.OpenAI(api_key=open_ai_key)
-
     prompt = f"""
     다음은 영수증에서 OCR로 추출된 텍스트입니다.
     이 텍스트에서 다음 정보를 추출하여 **반드시 JSON 형식으로** 반환해주세요.
@@ -98,7 +99,7 @@ async def analyze_receipt(text_data: str, open_ai_key: str):
     """
 
     try:
-        res = client.chat.completions.create(
+        res = await client.chat.completions.create(
             model='gpt-4o',
             messages=[
                 {"role": "system", "content": "You are a highly accurate assistant specialized in extracting structured information from receipt texts. Always respond in JSON format."},
@@ -0,0 +1,174 @@
+import io
+
+from app.core.cache import content_hash
+from app.core.config import (
+    STT_NORMALIZE_FORMAT,
+    STT_NORMALIZE_SAMPLE_RATE,
+    STT_NORMALIZE_BITRATE,
+    STT_CHUNK_TARGET_SECONDS,
+    STT_CHUNK_OVERLAP_MS,
+    STT_SILENCE_MIN_MS,
+    STT_SILENCE_OFFSET_DB,
+    STT_SILENCE_KEEP_MS,
+)
+
+# 정규화 형식 → (pydub export format, ffmpeg 인코더, 결과 확장자). wav는 ffmpeg 없이 pydub이 직접 기록
+NORMALIZE_FORMATS = {
+    "mp3": ("mp3", "libmp3lame", ".mp3"),
+    "opus": ("ogg", "libopus", ".ogg"),
+    "wav": ("wav", None, ".wav"),
+}
+
+
+def speech_segments(
+    audio,
+    target_ms: int = STT_CHUNK_TARGET_SECONDS * 1000,
+    overlap_ms: int = STT_CHUNK_OVERLAP_MS,
+    min_silence_ms: int = STT_SILENCE_MIN_MS,
+    silence_offset_db: float = STT_SILENCE_OFFSET_DB,
+    keep_silence_ms: int = STT_SILENCE_KEEP_MS,
+) -> list[tuple]:
+    """
+    pydub AudioSegment에서 무음 구간을 걷어내고 약 target_ms 길이의 음성 조각 목록으로 나눕니다.
+    조각 경계는 가능하면 무음 구간에 두고, 한 번에 target_ms보다 길게 말한 구간만 overlap_ms씩 겹치게 자릅니다.
+    소리가 전혀 없으면 빈 목록을 반환합니다.
+
+    Returns:
+        list: [(음성 조각, 앞 조각과 overlap_ms만큼 겹치게 잘렸는지 여부), ...] 재생 순서대로
+    """
+    from pydub import AudioSegment
+    from pydub.silence import detect_nonsilent
+
+    if len(audio) == 0 or audio.dBFS == float("-inf"):
+        return []
+
+    ranges = detect_nonsilent(
+        audio,
+        min_silence_len=min_silence_ms,
+        silence_thresh=audio.dBFS - silence_offset_db,
+        seek_step=10,
+    )
+
+    # 음성 구간 앞뒤로 여유를 두고, 여유 때문에 겹치는 구간은 합침
+    merged: list[list[int]] = []
+    for start, end in ranges:
+        start, end = max(0, start - keep_silence_ms), min(len(audio), end + keep_silence_ms)
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+
+    # target_ms보다 긴 연속 발화는 겹치게 잘라 단어가 경계에서 잘려도 양쪽 조각에 남도록 함
+    pieces: list[tuple[int, int, bool]] = []
+    step = max(1, target_ms - overlap_ms)
+    for start, end in merged:
+        overlapped = False
+        while end - start > target_ms:
+            pieces.append((start, start + target_ms, overlapped))
+            start += step
+            overlapped = True
+        pieces.append((start, end, overlapped))
+
+    # 이어지는 음성 구간을 target_ms까지 한 조각으로 묶음 (사이의 긴 무음은 짧은 간격으로 대체)
+    # 겹치게 자른 조각은 앞 조각이 이미 target_ms를 채웠으므로 항상 새 조각의 시작이 됨
+    gap = AudioSegment.silent(duration=keep_silence_ms, frame_rate=audio.frame_rate)
+    segments = []
+    current, current_ms, current_overlapped = None, 0, False
+    for start, end, overlapped in pieces:
+        if current is not None and current_ms + (end - start) > target_ms:
+            segments.append((current, current_overlapped))
+            current, current_ms = None, 0
+        piece = audio[start:end]
+        if current is None:
+            current, current_overlapped = piece, overlapped
+        else:
+            current = current + gap + piece
+        current_ms += end - start
+    if current is not None:
+        segments.append((current, current_overlapped))
+    return segments
+
+
+def decode_audio_for_stt(content: bytes, ext: str, sample_rate: int = STT_NORMALIZE_SAMPLE_RATE) -> tuple:
+    """
+    오디오를 sample_rate 모노 16비트 PCM으로 디코딩하고, 그 PCM의 해시(fingerprint)를 계산합니다.
+    같은 인코딩 스트림이면 컨테이너나 샘플 배치가 달라도 같은 해시가 나오므로 전사 캐시 키로 사용합니다.
+    (손실 압축으로 다시 인코딩한 파일은 PCM이 달라져 해시도 달라짐)
+
+    Returns:
+        tuple: (정규화된 pydub AudioSegment, PCM 해시(fingerprint)와 원본 크기/샘플레이트/채널/길이 통계)
+    """
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(io.BytesIO(content), format=ext.lstrip("."))
+    stats = {
+        "duration_seconds": round(audio.duration_seconds, 2),
+        "original_format": ext,
+        "original_bytes": len(content),
+        "original_sample_rate": audio.frame_rate,
+        "original_channels": audio.channels,
+    }
+
+    normalized = audio.set_channels(1).set_frame_rate(sample_rate).set_sample_width(2)
+    stats["fingerprint"] = content_hash(normalized.raw_data)
+    return normalized, stats
+
+
+def encode_audio_for_stt(
+    normalized,
+    content: bytes,
+    stats: dict,
+    target_format: str = STT_NORMALIZE_FORMAT,
+    bitrate: str = STT_NORMALIZE_BITRATE,
+    chunk: bool = True,
+) -> tuple[list[tuple[bytes, str]], dict]:
+    """
+    decode_audio_for_stt 결과를 Whisper 업로드용으로 target_format 재인코딩합니다.
+    chunk=True면 무음 구간을 제거하고 음성 조각별로 나눠 인코딩합니다. (소리가 없으면 빈 목록)
+    조각마다 앞 조각과 겹치게 잘렸는지 여부를 stats["overlaps"]에 순서대로 기록합니다.
+    chunk=False이고 결과가 원본(content)보다 크면 원본을 그대로 돌려줍니다.
+
+    Returns:
+        tuple: ([(오디오 바이트, 확장자), ...], decode 통계 + 결과 크기/조각 수 통계)
+    """
+    export_format, codec, target_ext = NORMALIZE_FORMATS[target_format]
+    stats = dict(stats)
+    ext = stats["original_format"]
+
+    segments = speech_segments(normalized) if chunk else [(normalized, False)]
+
+    outputs = []
+    for segment, _ in segments:
+        output = io.BytesIO()
+        segment.export(output, format=export_format, codec=codec, bitrate=bitrate)
+        outputs.append((output.getvalue(), target_ext))
+    sent_bytes = sum(len(data) for data, _ in outputs)
+
+    if not chunk and sent_bytes >= len(content):
+        stats.update(sent_format=ext, sent_bytes=len(content), bytes_saved=0, chunks=1,
+                     speech_seconds=stats["duration_seconds"], overlaps=[False])
+        return [(content, ext)], stats
+
+    stats.update(
+        sent_format=target_ext,
+        sent_bytes=sent_bytes,
+        sent_sample_rate=normalized.frame_rate,
+        sent_channels=1,
+        bytes_saved=len(content) - sent_bytes,
+        chunks=len(outputs),
+        overlaps=[overlapped for _, overlapped in segments],
+        speech_seconds=round(sum(segment.duration_seconds for segment, _ in segments), 2),
+    )
+    return outputs, stats
+
+
+def log_audio_normalize_stats(stats: dict) -> None:
+    """오디오 정규화/분할 결과(전송량 절감) 로그"""
+    original_bytes = stats["original_bytes"]
+    saved_ratio = stats["bytes_saved"] / original_bytes * 100 if original_bytes else 0
+    print(
+        f"[STT 정규화] {stats['duration_seconds']}초 (음성 {stats['speech_seconds']}초, 조각 {stats['chunks']}개), "
+        f"{stats['original_format']} {stats['original_sample_rate']}Hz {stats['original_channels']}ch → "
+        f"{stats['sent_format']}, bytes {original_bytes} → {stats['sent_bytes']} "
+        f"(절감 {stats['bytes_saved']}, {saved_ratio:.0f}%)"
+    )
@@ -0,0 +1,199 @@
+import base64
+import io
+import math
+from typing import BinaryIO
+
+from PIL import Image, ImageFilter, ImageOps
+
+from app.core.config import (
+    RECEIPT_OCR_MAX_LONG_EDGE,
+    RECEIPT_OCR_GRAYSCALE,
+    RECEIPT_OCR_JPEG_QUALITY,
+    VISION_DETAIL,
+    VISION_MAX_LONG_EDGE,
+    VISION_MAX_SHORT_EDGE,
+    VISION_LOW_DETAIL_EDGE,
+    VISION_TEXT_DENSITY_THRESHOLD,
+    VISION_JPEG_QUALITY,
+)
+
+
+def _read_bytes(image: bytes | BinaryIO) -> bytes:
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    image.seek(0)
+    data = image.read()
+    image.seek(0)
+    return data
+
+
+def preprocess_receipt_image(
+    image: bytes | BinaryIO,
+    image_format: str = "jpg",
+    max_long_edge: int = RECEIPT_OCR_MAX_LONG_EDGE,
+    grayscale: bool = RECEIPT_OCR_GRAYSCALE,
+    quality: int = RECEIPT_OCR_JPEG_QUALITY,
+) -> tuple[bytes, str]:
+    """
+    OCR 전송 전에 영수증 사진을 가볍게 만듭니다.
+    EXIF 방향 보정 → 긴 변 max_long_edge 이하로 축소 → (선택) 흑백 변환 → JPEG 재인코딩 순서로 처리하며,
+    결과가 원본보다 크고 회전 보정도 필요 없으면 원본을 그대로 돌려줍니다.
+    CPU 작업이므로 비동기 코드에서는 이벤트 루프 밖(스레드/프로세스 풀)에서 호출하세요.
+
+    Returns:
+        tuple[bytes, str]: (전송할 이미지 내용, 이미지 형식)
+    """
+    original = _read_bytes(image)
+
+    try:
+        with Image.open(io.BytesIO(original)) as opened:
+            original_size = opened.size
+            # EXIF Orientation(0x0112)이 1이 아니면 회전 보정이 필요한 사진
+            rotated = opened.getexif().get(0x0112, 1) != 1
+            processed = ImageOps.exif_transpose(opened)
+
+            if grayscale:
+                processed = processed.convert("L")
+            elif processed.mode != "RGB":
+                processed = processed.convert("RGB")
+
+            if max(processed.size) > max_long_edge:
+                processed.thumbnail((max_long_edge, max_long_edge), Image.Resampling.LANCZOS)
+
+            buffer = io.BytesIO()
+            processed.save(buffer, format="JPEG", quality=quality, optimize=True)
+            result = buffer.getvalue()
+            result_size = processed.size
+    except Exception as e:
+        print(f"WARNING: 영수증 이미지 전처리 실패, 원본을 그대로 사용합니다: {type(e).__name__}: {e}")
+        return original, image_format
+
+    if len(result) >= len(original) and not rotated:
+        print(f"INFO: 영수증 이미지 전처리 생략 (원본 {len(original)} bytes가 더 작음)")
+        return original, image_format
+
+    saved = len(original) - len(result)
+    ratio = saved / len(original) * 100 if original else 0.0
+    print(
+        f"INFO: 영수증 이미지 전처리 완료: {original_size[0]}x{original_size[1]} → {result_size[0]}x{result_size[1]}, "
+        f"{len(original)} → {len(result)} bytes ({saved} bytes, {ratio:.1f}% 절감)"
+    )
+    return result, "jpg"
+
+
+def _vision_high_detail_size(width: int, height: int, max_long_edge: int, max_short_edge: int) -> tuple[int, int]:
+    """high detail 이미지가 모델 내부에서 축소되는 크기 (긴 변 max_long_edge, 짧은 변 max_short_edge 이내)"""
+    scale = min(1.0, max_long_edge / max(width, height))
+    if min(width, height) * scale > max_short_edge:
+        scale = max_short_edge / min(width, height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """
+    차이 해시(dHash). 흑백 (hash_size+1)x hash_size 썸네일에서 가로로 이웃한 픽셀의 밝기 대소를 비트로 기록합니다.
+    각도나 압축률이 조금 다른 같은 사진은 해밍 거리가 작게 나옵니다. (기본 64비트)
+    """
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def vision_image_tokens(width: int, height: int, detail: str) -> int:
+    """GPT-4o 이미지 입력 토큰 수 추정 (low: 85, high: 85 + 512px 타일당 170)"""
+    if detail == "low":
+        return 85
+    width, height = _vision_high_detail_size(width, height, 2048, 768)
+    tiles = math.ceil(width / 512) * math.ceil(height / 512)
+    return 85 + 170 * tiles
+
+
+def _text_density(image: Image.Image) -> float:
+    """작은 흑백 썸네일의 윤곽선 픽셀 비율로 글자/세부 묘사 밀도를 추정"""
+    thumb = image.convert("L")
+    thumb.thumbnail((256, 256))
+    edges = thumb.filter(ImageFilter.FIND_EDGES)
+    histogram = edges.histogram()
+    strong = sum(histogram[64:])
+    return strong / max(1, thumb.size[0] * thumb.size[1])
+
+
+def prepare_vision_image(
+    image_bytes: bytes,
+    detail: str = VISION_DETAIL,
+    max_long_edge: int = VISION_MAX_LONG_EDGE,
+    max_short_edge: int = VISION_MAX_SHORT_EDGE,
+    low_detail_edge: int = VISION_LOW_DETAIL_EDGE,
+    density_threshold: float = VISION_TEXT_DENSITY_THRESHOLD,
+    quality: int = VISION_JPEG_QUALITY,
+) -> dict:
+    """
+    GPT Vision 전송용 이미지를 준비합니다.
+    모델이 어차피 축소해서 사용하는 해상도까지만 남기고 JPEG base64로 인코딩하며,
+    detail이 auto이면 작은 이미지나 글자가 거의 없는 이미지에 low detail을 선택합니다.
+    축소나 회전 보정이 필요 없는 JPEG은 재인코딩 결과가 원본보다 크면 원본을 그대로 보냅니다.
+
+    Returns:
+        dict: base64, detail, dhash(지각 해시), 원본/전송 크기와 바이트 수, 토큰 추정치 및 절감량
+    """
+    with Image.open(io.BytesIO(image_bytes)) as opened:
+        # 원본을 그대로 보낼 수 있는지: 회전 보정이 필요 없는 RGB/흑백 JPEG
+        reusable = opened.format == "JPEG" and opened.mode in ("RGB", "L") and opened.getexif().get(0x0112, 1) == 1
+        image = ImageOps.exif_transpose(opened).convert("RGB")  # JPEG을 위해 RGB로 변환
+
+    image_hash = dhash(image)
+    original_size = image.size
+    if detail not in ("low", "high"):
+        if max(original_size) <= low_detail_edge:
+            detail = "low"
+        else:
+            detail = "low" if _text_density(image) < density_threshold else "high"
+
+    if detail == "low":
+        image.thumbnail((low_detail_edge, low_detail_edge), Image.Resampling.LANCZOS)
+    else:
+        target = _vision_high_detail_size(*original_size, max_long_edge, max_short_edge)
+        if target != original_size:
+            image = image.resize(target, Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    jpeg_bytes = buffer.getvalue()
+    if reusable and image.size == original_size and len(image_bytes) <= len(jpeg_bytes):
+        jpeg_bytes = image_bytes
+
+    # 이전 방식(원본 해상도 + high detail)과 비교한 절감량
+    original_tokens = vision_image_tokens(*original_size, "high")
+    sent_tokens = vision_image_tokens(*image.size, detail)
+    stats = {
+        "detail": detail,
+        "original_size": list(original_size),
+        "sent_size": list(image.size),
+        "original_bytes": len(image_bytes),
+        "sent_bytes": len(jpeg_bytes),
+        "bytes_saved": len(image_bytes) - len(jpeg_bytes),
+        "original_tokens": original_tokens,
+        "sent_tokens": sent_tokens,
+        "tokens_saved": original_tokens - sent_tokens,
+    }
+    return {
+        "base64": base64.b64encode(jpeg_bytes).decode("utf-8"),
+        "detail": detail,
+        "dhash": image_hash,
+        "stats": stats,
+    }
+
+
+def log_vision_image_stats(stats: dict) -> None:
+    """GPT Vision 전송 이미지의 바이트/토큰 절감량 로그"""
+    print(
+        f"[VISION] detail={stats['detail']}, "
+        f"{stats['original_size'][0]}x{stats['original_size'][1]} → {stats['sent_size'][0]}x{stats['sent_size'][1]}, "
+        f"bytes {stats['original_bytes']} → {stats['sent_bytes']} (절감 {stats['bytes_saved']}), "
+        f"tokens {stats['original_tokens']} → {stats['sent_tokens']} (절감 {stats['tokens_saved']})"
+    )
@@ -0,0 +1,42 @@
+import re
+import unicodedata
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str | None) -> str:
+    """캐시 키 등에 쓰기 위한 텍스트 정규화: 유니코드(NFKC) 통일, 대소문자 무시, 공백 축약"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def _overlap_word(word: str) -> str:
+    return normalize_text(word).strip(".,!?~…\"'")
+
+
+def stitch_transcripts(texts: list[str], overlaps: list[bool] | None = None, max_overlap_words: int = 8) -> str:
+    """
+    순서대로 나눠 전사한 텍스트를 이어 붙입니다.
+    overlaps[i]가 True면 texts[i]의 오디오가 앞 조각 끝과 겹치게 잘린 것이므로, 그 경계에서만
+    앞 텍스트 끝과 뒤 텍스트 시작에 반복된 가장 긴 단어열을 한 번만 남깁니다.
+    무음에서 나눈 경계는 실제로 같은 말을 반복했을 수 있으므로 그대로 이어 붙입니다.
+    """
+    overlaps = overlaps or [False] * len(texts)
+    words: list[str] = []
+    previous = -1
+    for index, (text, overlapped) in enumerate(zip(texts, overlaps)):
+        next_words = text.split()
+        if not next_words:
+            continue
+        overlap = 0
+        # 바로 앞 조각의 텍스트가 비었다면 겹친 부분도 인식되지 않은 것이므로 중복 제거하지 않음
+        if overlapped and previous == index - 1:
+            for size in range(min(max_overlap_words, len(words), len(next_words)), 0, -1):
+                if [_overlap_word(w) for w in words[-size:]] == [_overlap_word(w) for w in next_words[:size]]:
+                    overlap = size
+                    break
+        words.extend(next_words[overlap:])
+        previous = index
+    return " ".join(words)
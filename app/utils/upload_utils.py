@@ -0,0 +1,167 @@
+import tempfile
+from typing import AsyncIterator, BinaryIO, Callable
+
+from python_multipart.exceptions import ParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+# 파일 외 multipart 경계/헤더/다른 필드에 허용하는 여유 바이트
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class InvalidUploadError(ValueError):
+    """multipart 형식이 잘못되었거나 파일 필드가 없음"""
+
+
+class UploadTooLargeError(ValueError):
+    """업로드 크기 제한 초과"""
+
+
+async def read_multipart_file(
+    content_type: str,
+    body: AsyncIterator[bytes],
+    field_name: str,
+    max_bytes: int,
+    validate_filename: Callable[[str], None] | None = None,
+    spool_max_size: int | None = None,
+) -> tuple[str, bytes | BinaryIO]:
+    """
+    multipart/form-data 요청 본문을 조각 단위로 읽으며 field_name 파일 필드 하나만 메모리 버퍼에 모읍니다.
+    파일이 max_bytes를 넘는 순간 UploadTooLargeError를 발생시켜 남은 본문을 더 읽지 않으며,
+    validate_filename은 파일 헤더를 읽은 직후(본문을 받기 전) 호출됩니다.
+    spool_max_size를 주면 파일 내용 대신 SpooledTemporaryFile을 반환합니다. (read_multipart_files 참고)
+
+    Returns:
+        tuple: (파일명, 파일 내용 또는 처음 위치로 되감은 SpooledTemporaryFile)
+    """
+    files = await read_multipart_files(
+        content_type, body, field_name, max_bytes, max_bytes, max_files=1,
+        validate_filename=validate_filename, spool_max_size=spool_max_size,
+    )
+    return files[0]
+
+
+async def read_multipart_files(
+    content_type: str,
+    body: AsyncIterator[bytes],
+    field_name: str,
+    max_file_bytes: int,
+    max_total_bytes: int,
+    max_files: int,
+    validate_filename: Callable[[str], None] | None = None,
+    spool_max_size: int | None = None,
+) -> list[tuple[str, bytes | BinaryIO]]:
+    """
+    multipart/form-data 요청 본문을 조각 단위로 읽으며 field_name 파일 필드들만 메모리 버퍼에 모읍니다.
+    파일 하나가 max_file_bytes를, 파일 합계가 max_total_bytes를 넘는 순간 UploadTooLargeError를 발생시켜
+    남은 본문을 더 읽지 않으며, 파일이 max_files개를 넘으면 InvalidUploadError를 발생시킵니다.
+    validate_filename은 파일마다 헤더를 읽은 직후(본문을 받기 전) 호출됩니다.
+    spool_max_size를 주면 파일마다 SpooledTemporaryFile에 써서 그 크기까지만 메모리에 두고 넘으면 디스크로 넘기며,
+    호출한 쪽에서 반환된 파일을 닫아야 합니다. (오류가 나면 여기서 닫음)
+
+    Returns:
+        list: [(파일명, 파일 내용 또는 처음 위치로 되감은 SpooledTemporaryFile), ...] 업로드 순서대로
+    """
+    mime_type, options = parse_options_header(content_type)
+    boundary = options.get(b"boundary")
+    if mime_type != b"multipart/form-data" or not boundary:
+        raise InvalidUploadError("multipart/form-data 형식의 요청이 아닙니다.")
+
+    file_too_large = f"파일 크기는 {max_file_bytes // (1024 * 1024)}MB를 초과할 수 없습니다."
+    total_too_large = f"업로드 전체 크기는 {max_total_bytes // (1024 * 1024)}MB를 초과할 수 없습니다."
+
+    header_field = bytearray()
+    header_value = bytearray()
+    headers: dict[bytes, bytes] = {}
+    state = {"target": False, "open": False, "total_file_bytes": 0}
+    files: list[tuple[str, bytearray | BinaryIO]] = []
+    sizes: list[int] = []
+    total = 0
+
+    def on_part_begin():
+        headers.clear()
+
+    def on_header_field(data, start, end):
+        header_field.extend(data[start:end])
+
+    def on_header_value(data, start, end):
+        header_value.extend(data[start:end])
+
+    def on_header_end():
+        headers[bytes(header_field).lower()] = bytes(header_value)
+        header_field.clear()
+        header_value.clear()
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(headers.get(b"content-disposition", b""))
+        state["target"] = (
+            disposition.get(b"name", b"").decode("utf-8", "replace") == field_name
+            and b"filename" in disposition
+        )
+        if state["target"]:
+            if len(files) >= max_files:
+                raise InvalidUploadError(f"'{field_name}' 파일은 한 번에 최대 {max_files}개까지 업로드할 수 있습니다.")
+            filename = disposition[b"filename"].decode("utf-8", "replace")
+            if validate_filename is not None:
+                validate_filename(filename)
+            buffer = bytearray() if spool_max_size is None else tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+            files.append((filename, buffer))
+            sizes.append(0)
+            state["open"] = True
+
+    def on_part_data(data, start, end):
+        if not state["target"]:
+            return
+        if sizes[-1] + (end - start) > max_file_bytes:
+            raise UploadTooLargeError(file_too_large)
+        state["total_file_bytes"] += end - start
+        if state["total_file_bytes"] > max_total_bytes:
+            raise UploadTooLargeError(total_too_large)
+        sizes[-1] += end - start
+        content = files[-1][1]
+        if isinstance(content, bytearray):
+            content.extend(data[start:end])
+        else:
+            content.write(data[start:end])
+
+    def on_part_end():
+        if state["target"]:
+            state["target"] = False
+            state["open"] = False
+
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    try:
+        async for chunk in body:
+            total += len(chunk)
+            if total > max_total_bytes + MULTIPART_OVERHEAD_BYTES:
+                raise UploadTooLargeError(total_too_large if max_files > 1 else file_too_large)
+            try:
+                parser.write(chunk)
+            except ParseError as e:
+                raise InvalidUploadError(f"multipart 본문 형식이 올바르지 않습니다: {e}") from e
+        parser.finalize()
+
+        if not files:
+            raise InvalidUploadError(f"'{field_name}' 파일 필드가 없습니다.")
+        if state["open"]:
+            # 닫는 경계 없이 본문이 끝나면 파일이 잘린 것이므로 처리하지 않음
+            raise InvalidUploadError("업로드가 완료되지 않았습니다. (multipart 본문이 중간에 끊김)")
+    except BaseException:
+        for _, content in files:
+            if not isinstance(content, bytearray):
+                content.close()
+        raise
+
+    if spool_max_size is None:
+        return [(filename, bytes(content)) for filename, content in files]
+    for _, content in files:
+        content.seek(0)
+    return files
@@ -1,19 +1,38 @@
 # /main.py
 
-import uuid
 import os
-import shutil
 import json
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 from dotenv import load_dotenv
 
 from app.routers import auth_router, protected_router, stt_router, product_router
 from app.core.init_db import init_db
-from app.services.receipt_analyzer import call_clova_ocr, extract_texts_from_clova, extract_receipt_info_with_gpt
+from app.core.config import (
+    RECEIPT_SPOOL_MAX_SIZE,
+    RECEIPT_MAX_IMAGE_BYTES,
+    RECEIPT_BATCH_MAX_FILES,
+    RECEIPT_BATCH_MAX_TOTAL_BYTES,
+    RECEIPT_BATCH_CONCURRENCY,
+)
+from app.core.clients import init_ocr_client, close_ocr_client, init_openai_clients, close_openai_clients
+from app.core.workers import init_image_pool, shutdown_image_pool, init_audio_pool, shutdown_audio_pool
+from app.core.audio import init_audio_toolchain
+from app.services.stt_backends import init_stt_backends
+from app.services.receipt_analyzer import clova_image_format
+from app.services.receipt_pipeline import analyze_receipt_image, analyze_receipt_images
+from app.services.receipt_cache import receipt_cache_stats
+from app.services.product_catalog_service import product_catalog
+from app.utils.upload_utils import (
+    MULTIPART_OVERHEAD_BYTES,
+    InvalidUploadError,
+    UploadTooLargeError,
+    read_multipart_file,
+    read_multipart_files,
+)
 
 
 # .env 파일 로드
@@ -41,6 +60,21 @@ app = FastAPI(
 @app.on_event("startup")
 async def startup_event():
     init_db()
+    product_catalog.load()
+    init_ocr_client()
+    init_openai_clients()
+    init_image_pool()
+    init_audio_toolchain()
+    init_audio_pool()
+    init_stt_backends()
+
+# 애플리케이션 종료 시 공용 클라이언트 정리
+@app.on_event("shutdown")
+async def shutdown_event():
+    await close_ocr_client()
+    await close_openai_clients()
+    shutdown_image_pool()
+    shutdown_audio_pool()
 
 # CORS 설정
 app.add_middleware(
@@ -57,10 +91,6 @@ app.include_router(protected_router.router)
 app.include_router(stt_router.router)
 app.include_router(product_router.router)
 
-# 임시 파일 저장을 위한 디렉토리 설정
-UPLOAD_DIR = "uploaded_images"
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-
 
 @app.get("/")
 def root():
@@ -121,45 +151,75 @@ def custom_openapi():
 
 app.openapi_schema = custom_openapi()
 
-@app.post("/analyze-receipt/")
-async def analyze_receipt_endpoint(image: UploadFile = File(...)):
-    """
-    영수증 이미지를 받아 클로바 OCR과 OpenAI GPT를 사용하여 정보를 분석합니다.
-    """
-    allowed_extensions = {"jpg", "jpeg", "png"}
-    file_extension = image.filename.split(".")[-1].lower() if image.filename else ""
-    if not file_extension or file_extension not in allowed_extensions:
-        raise HTTPException(status_code=400, detail="허용되지 않는 이미지 형식입니다. (jpg, jpeg, png만 허용)")
+RECEIPT_IMAGE_EXTENSIONS = {"jpg", "jpeg", "png"}
 
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    temp_image_path = os.path.join(UPLOAD_DIR, unique_filename)
 
-    try:
-        with open(temp_image_path, "wb") as buffer:
-            shutil.copyfileobj(image.file, buffer)
+def _receipt_extension(filename: str | None) -> str:
+    return filename.split(".")[-1].lower() if filename else ""
 
-        print(f"INFO: 이미지 파일이 임시 저장되었습니다: {temp_image_path}")
 
-        print("INFO: 클로바 OCR API 호출 중...")
-        ocr_result = call_clova_ocr(temp_image_path, CLOVA_OCR_URL, CLOVA_OCR_SECRET)
+# 본문을 직접 읽으므로 문서(OpenAPI)에 multipart 파일 필드를 명시
+RECEIPT_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"image": {"type": "string", "format": "binary"}},
+                    "required": ["image"],
+                }
+            }
+        },
+    }
+}
 
-        if not ocr_result:
-            print("ERROR: OCR 처리 중 오류 발생: 클로바 OCR 응답 없음 또는 오류 발생.")
-            raise HTTPException(status_code=500, detail="영수증 OCR 처리 중 오류가 발생했습니다.")
 
-        ocr_text = extract_texts_from_clova(ocr_result)
-        print("INFO: OCR 텍스트 추출 완료.")
+def _validate_receipt_filename(filename: str) -> None:
+    # 이미지 형식 검증 (파일 본문을 받기 전에 확인)
+    if _receipt_extension(filename) not in RECEIPT_IMAGE_EXTENSIONS:
+        raise HTTPException(status_code=400, detail="허용되지 않는 이미지 형식입니다. (jpg, jpeg, png만 허용)")
 
-        print("INFO: OpenAI GPT로 영수증 정보 추출 중...")
-        receipt_info = extract_receipt_info_with_gpt(ocr_text, OPENAI_API_KEY)
 
-        if not receipt_info:
-            print("ERROR: GPT를 통한 영수증 정보 추출 실패.")
-            raise HTTPException(status_code=500, detail="영수증 정보 추출 중 오류가 발생했습니다. (GPT 응답 문제)")
+@app.post("/analyze-receipt/", openapi_extra=RECEIPT_REQUEST_BODY)
+async def analyze_receipt_endpoint(request: Request):
+    """
+    영수증 이미지를 받아 클로바 OCR과 OpenAI GPT를 사용하여 정보를 분석합니다.
+    업로드는 RECEIPT_SPOOL_MAX_SIZE까지 메모리에 보관하고 그보다 크면 디스크 임시 파일로 넘기며,
+    RECEIPT_MAX_IMAGE_BYTES를 넘으면 끝까지 받지 않고 거절합니다.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"파일 크기는 {RECEIPT_MAX_IMAGE_BYTES // (1024 * 1024)}MB를 초과할 수 없습니다."
+    )
+
+    # Content-Length가 있으면 본문을 읽기 전에 거절
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > RECEIPT_MAX_IMAGE_BYTES + MULTIPART_OVERHEAD_BYTES:
+        raise too_large
 
-        print("INFO: 영수증 정보 추출 완료.")
+    try:
+        filename, image = await read_multipart_file(
+            request.headers.get("content-type", ""),
+            request.stream(),
+            field_name="image",
+            max_bytes=RECEIPT_MAX_IMAGE_BYTES,
+            validate_filename=_validate_receipt_filename,
+            spool_max_size=RECEIPT_SPOOL_MAX_SIZE,
+        )
+    except UploadTooLargeError:
+        raise too_large
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-        return JSONResponse(content=receipt_info)
+    try:
+        # 업로드 버퍼(SpooledTemporaryFile)를 그대로 전달하여 임시 파일 저장/재오픈/삭제 과정을 생략
+        result = await analyze_receipt_image(image, CLOVA_OCR_URL, CLOVA_OCR_SECRET, clova_image_format(filename))
+
+        if not result["success"]:
+            raise HTTPException(status_code=500, detail=result["error"])
+
+        return JSONResponse(content=result["receipt_info"])
 
     except HTTPException as e:
         raise e
@@ -167,6 +227,76 @@ async def analyze_receipt_endpoint(image: UploadFile = File(...)):
         print(f"FATAL: 서버 내부 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=f"서버 내부 오류 발생: {type(e).__name__}")
     finally:
-        if os.path.exists(temp_image_path):
-            os.remove(temp_image_path)
-            print(f"INFO: 임시 파일 삭제 완료: {temp_image_path}")
\ No newline at end of file
+        image.close()
+
+
+# 본문을 직접 읽으므로 문서(OpenAPI)에 multipart 파일 목록 필드를 명시
+RECEIPT_BATCH_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"images": {"type": "array", "items": {"type": "string", "format": "binary"}}},
+                    "required": ["images"],
+                }
+            }
+        },
+    }
+}
+
+
+@app.post("/analyze-receipts/batch", openapi_extra=RECEIPT_BATCH_REQUEST_BODY)
+async def analyze_receipts_batch_endpoint(request: Request):
+    """
+    여러 영수증 이미지를 동시에 분석하고, 끝나는 순서대로 결과를 NDJSON(한 줄에 JSON 하나)으로 스트리밍합니다.
+    각 줄의 index는 업로드 순서(0부터)입니다.
+    요청 본문을 조각 단위로 읽으며 이미지 1장/전체 크기 제한을 확인하므로, 제한을 넘는 업로드는 끝까지 받지 않고 바로 거절합니다.
+    """
+    # Content-Length가 있으면 본문을 읽기 전에 거절
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > RECEIPT_BATCH_MAX_TOTAL_BYTES + MULTIPART_OVERHEAD_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"업로드 전체 크기는 {RECEIPT_BATCH_MAX_TOTAL_BYTES // (1024 * 1024)}MB를 초과할 수 없습니다."
+        )
+
+    try:
+        images = await read_multipart_files(
+            request.headers.get("content-type", ""),
+            request.stream(),
+            field_name="images",
+            max_file_bytes=RECEIPT_MAX_IMAGE_BYTES,
+            max_total_bytes=RECEIPT_BATCH_MAX_TOTAL_BYTES,
+            max_files=RECEIPT_BATCH_MAX_FILES,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidUploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filenames = [filename for filename, _ in images]
+    contents = [content for _, content in images]
+    invalid = [index for index, name in enumerate(filenames) if _receipt_extension(name) not in RECEIPT_IMAGE_EXTENSIONS]
+    valid_indexes = [index for index in range(len(images)) if index not in invalid]
+
+    async def stream_results():
+        for index in invalid:
+            line = {"index": index, "filename": filenames[index], "success": False,
+                    "error": "허용되지 않는 이미지 형식입니다. (jpg, jpeg, png만 허용)"}
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+        batch = [(contents[index], clova_image_format(filenames[index])) for index in valid_indexes]
+        async for position, result in analyze_receipt_images(batch, CLOVA_OCR_URL, CLOVA_OCR_SECRET, RECEIPT_BATCH_CONCURRENCY):
+            index = valid_indexes[position]
+            line = {"index": index, "filename": filenames[index], **result}
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+@app.get("/analyze-receipt/cache-stats")
+def receipt_cache_stats_endpoint():
+    """영수증 분석 캐시(이미지 / OCR 텍스트) 적중·미스 통계"""
+    return receipt_cache_stats()
@@ -0,0 +1,79 @@
+import asyncio
+import base64
+import json
+
+import httpx
+
+from app.services import receipt_analyzer
+
+IMAGES = [(b"first", "jpg"), (b"second", "png"), (b"third", "jpg")]
+
+
+def _field(text: str) -> dict:
+    return {"inferText": text}
+
+
+def _run(monkeypatch, respond):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        return respond(body)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(receipt_analyzer, "get_ocr_client", lambda: client)
+    results = asyncio.run(receipt_analyzer.call_clova_ocr_multi(IMAGES, "http://clova", "secret"))
+    return results, requests
+
+
+def _texts(result: dict | None) -> str | None:
+    return receipt_analyzer.extract_texts_from_clova(result) if result is not None else None
+
+
+def test_splits_response_by_image_name(monkeypatch):
+    def respond(body):
+        images = [
+            {"name": image["name"], "inferResult": "SUCCESS", "fields": [_field(base64.b64decode(image["data"]).decode())]}
+            for image in body["images"]
+        ]
+        return httpx.Response(200, json={"version": "V2", "requestId": body["requestId"], "images": images[::-1]})
+
+    results, requests = _run(monkeypatch, respond)
+
+    assert len(requests) == 1
+    assert [image["format"] for image in requests[0]["images"]] == ["jpg", "png", "jpg"]
+    assert [_texts(result) for result in results] == ["first", "second", "third"]
+    assert all(result["version"] == "V2" and len(result["images"]) == 1 for result in results)
+
+
+def test_falls_back_to_position_when_names_are_missing(monkeypatch):
+    def respond(body):
+        images = [{"inferResult": "SUCCESS", "fields": [_field(f"text{index}")]} for index in range(3)]
+        return httpx.Response(200, json={"images": images})
+
+    results, _ = _run(monkeypatch, respond)
+
+    assert [_texts(result) for result in results] == ["text0", "text1", "text2"]
+
+
+def test_failed_or_missing_images_become_none(monkeypatch):
+    def respond(body):
+        first, second, _ = (image["name"] for image in body["images"])
+        images = [
+            {"name": first, "inferResult": "SUCCESS", "fields": [_field("ok")]},
+            {"name": second, "inferResult": "FAILURE", "message": "unreadable", "fields": []},
+        ]
+        return httpx.Response(200, json={"images": images})
+
+    results, _ = _run(monkeypatch, respond)
+
+    assert _texts(results[0]) == "ok"
+    assert results[1] is None
+    assert results[2] is None
+
+
+def test_http_error_fails_every_image(monkeypatch):
+    results, _ = _run(monkeypatch, lambda body: httpx.Response(500, json={"message": "error"}))
+
+    assert results == [None, None, None]
@@ -0,0 +1,27 @@
+from app.services.product_image_index import PerceptualHashIndex
+
+
+def test_nearest_finds_hash_within_max_distance():
+    index = PerceptualHashIndex(max_distance=6, max_entries=10)
+    index.add(0x0AAAA8857555F334, "진라면")
+    assert index.nearest(0x0AAAA8857555F334 ^ 0b101) == ("진라면", 2)
+    assert index.nearest(0x0AAAA8857555F334 ^ 0xFFFF) is None
+
+
+def test_full_index_reuses_oldest_slot():
+    index = PerceptualHashIndex(max_distance=6, max_entries=2)
+    hashes = [0x0123456789ABCDEF, 0xFEDCBA9876543210, 0x0F0F0F0F0F0F0F0F]
+    for value, image_hash in enumerate(hashes):
+        assert index.add(image_hash, value)
+
+    assert len(index) == 2
+    assert index.nearest(hashes[0]) is None
+    assert index.nearest(hashes[1]) == (1, 0)
+    assert index.nearest(hashes[2]) == (2, 0)
+
+
+def test_duplicate_hash_is_not_added():
+    index = PerceptualHashIndex(max_distance=6, max_entries=2)
+    assert index.add(0x0123456789ABCDEF, "a")
+    assert not index.add(0x0123456789ABCDEF, "b")
+    assert index.nearest(0x0123456789ABCDEF) == ("a", 0)
@@ -0,0 +1,13 @@
+from app.services.receipt_cache import ocr_text_key
+
+
+def test_blank_or_short_ocr_text_has_no_cache_key():
+    assert ocr_text_key("") is None
+    assert ocr_text_key("   \n ") is None
+    assert ocr_text_key("합계 1000") is None
+
+
+def test_ocr_text_key_ignores_case_and_whitespace():
+    text = "이마트 성수점\n우유 2,500\n합계 2,500원 CARD"
+    assert ocr_text_key(text) is not None
+    assert ocr_text_key(text) == ocr_text_key("  이마트  성수점 우유 2,500 합계 2,500원 card ")
@@ -0,0 +1,44 @@
+import asyncio
+
+from app.services import receipt_pipeline
+
+
+def test_batch_analyzes_identical_images_once(monkeypatch):
+    ocr_batches, gpt_texts, stored = [], [], {}
+
+    async def no_preprocess(image, image_format):
+        return image, image_format
+
+    async def fake_ocr(images, api_url, secret_key):
+        ocr_batches.append([content for content, _ in images])
+        return [{"images": [{"fields": [{"inferText": content.decode()}]}]} for content, _ in images]
+
+    async def fake_gpt(text, *args, **kwargs):
+        gpt_texts.append(text)
+        return {"구매처": text}
+
+    class FakeCache:
+        async def aget(self, key):
+            return stored.get(key)
+
+        async def aset(self, key, value):
+            stored[key] = value
+
+    monkeypatch.setattr(receipt_pipeline, "_prepare_for_ocr", no_preprocess)
+    monkeypatch.setattr(receipt_pipeline, "call_clova_ocr_multi", fake_ocr)
+    monkeypatch.setattr(receipt_pipeline, "extract_texts_from_clova", lambda result: result["images"][0]["fields"][0]["inferText"])
+    monkeypatch.setattr(receipt_pipeline, "extract_receipt_info_with_gpt", fake_gpt)
+    monkeypatch.setattr(receipt_pipeline, "receipt_image_cache", FakeCache())
+    monkeypatch.setattr(receipt_pipeline, "receipt_text_cache", FakeCache())
+
+    images = [(b"receipt-a", "jpg"), (b"receipt-b", "jpg"), (b"receipt-a", "jpg")]
+
+    async def collect():
+        return [item async for item in receipt_pipeline.analyze_receipt_images(images, "url", "secret", 4)]
+
+    results = dict(asyncio.run(collect()))
+
+    assert sorted(results) == [0, 1, 2]
+    assert results[0] == results[2] == {"success": True, "receipt_info": {"구매처": "receipt-a"}, "cache": None}
+    assert sorted(content for batch in ocr_batches for content in batch) == [b"receipt-a", b"receipt-b"]
+    assert sorted(gpt_texts) == ["receipt-a", "receipt-b"]
@@ -0,0 +1,52 @@
+import pytest
+
+from app.utils.text_utils import stitch_transcripts
+
+
+def test_repeated_word_at_silence_boundary_is_kept():
+    assert stitch_transcripts(["안녕하세요 네", "네 반갑습니다"], [False, False]) == "안녕하세요 네 네 반갑습니다"
+
+
+def test_no_overlap_flags_means_plain_join():
+    assert stitch_transcripts(["안녕하세요 네", "네 반갑습니다"]) == "안녕하세요 네 네 반갑습니다"
+
+
+def test_overlapped_boundary_drops_longest_repeat():
+    texts = ["오늘 날씨가 정말 좋네요", "정말 좋네요. 산책 갈까요"]
+    assert stitch_transcripts(texts, [False, True]) == "오늘 날씨가 정말 좋네요 산책 갈까요"
+
+
+def test_only_flagged_boundaries_are_deduplicated():
+    texts = ["하나 둘", "둘 셋", "셋 넷"]
+    assert stitch_transcripts(texts, [False, False, True]) == "하나 둘 둘 셋 넷"
+
+
+def test_empty_previous_chunk_disables_dedup():
+    texts = ["하나 둘", "", "둘 셋"]
+    assert stitch_transcripts(texts, [False, True, True]) == "하나 둘 둘 셋"
+
+
+def test_overlap_is_limited_to_max_words():
+    texts = ["a b c", "a b c d"]
+    assert stitch_transcripts(texts, [False, True], max_overlap_words=2) == "a b c a b c d"
+
+
+def test_speech_segments_flags_only_overlapped_cuts():
+    pytest.importorskip("pydub")
+    from pydub import AudioSegment
+    from pydub.generators import Sine
+
+    from app.utils.audio_utils import speech_segments
+
+    tone = Sine(440).to_audio_segment(duration=2500, volume=-10).set_frame_rate(16000)
+    silence = AudioSegment.silent(duration=1500, frame_rate=16000)
+    # 2.5초 발화 - 1.5초 무음 - 2.5초 발화, 조각 목표 1초: 각 발화가 겹치게 잘리고 무음 경계는 겹치지 않음
+    audio = tone + silence + tone
+    segments = speech_segments(audio, target_ms=1000, overlap_ms=200, min_silence_ms=500, keep_silence_ms=0)
+
+    flags = [overlapped for _, overlapped in segments]
+    assert flags[0] is False
+    assert flags.count(False) == 2
+    first_of_second_utterance = flags.index(False, 1)
+    assert all(flags[1:first_of_second_utterance])
+    assert all(flags[first_of_second_utterance + 1:])
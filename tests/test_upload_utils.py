@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from app.utils.upload_utils import (
+    InvalidUploadError,
+    UploadTooLargeError,
+    read_multipart_file,
+    read_multipart_files,
+)
+
+BOUNDARY = "abc"
+CONTENT_TYPE = f"multipart/form-data; boundary={BOUNDARY}"
+
+
+def _part(name: str, content: bytes, filename: str | None = None) -> bytes:
+    disposition = f'form-data; name="{name}"'
+    if filename is not None:
+        disposition += f'; filename="{filename}"'
+    return (
+        f"--{BOUNDARY}\r\nContent-Disposition: {disposition}\r\n\r\n".encode()
+        + content
+        + b"\r\n"
+    )
+
+
+def _body(*parts: bytes) -> bytes:
+    return b"".join(parts) + f"--{BOUNDARY}--\r\n".encode()
+
+
+async def _chunks(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _read(data: bytes, max_bytes: int = 1024, **kwargs):
+    return asyncio.run(read_multipart_file(CONTENT_TYPE, _chunks(data), "file", max_bytes, **kwargs))
+
+
+def _read_many(data: bytes, max_file_bytes: int = 1024, max_total_bytes: int = 4096, max_files: int = 3):
+    return asyncio.run(
+        read_multipart_files(CONTENT_TYPE, _chunks(data), "images", max_file_bytes, max_total_bytes, max_files)
+    )
+
+
+def test_reads_file_field_and_skips_other_fields():
+    body = _body(_part("note", b"memo"), _part("file", b"hello audio", "voice.m4a"))
+    assert _read(body) == ("voice.m4a", b"hello audio")
+
+
+def test_rejects_oversized_file():
+    body = _body(_part("file", b"x" * 2048, "voice.m4a"))
+    with pytest.raises(UploadTooLargeError):
+        _read(body)
+
+
+def test_rejects_oversized_body_before_parsing_all_of_it():
+    consumed = []
+
+    async def endless():
+        yield f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\n".encode()
+        while True:
+            consumed.append(1)
+            yield b"x" * 64 * 1024
+
+    with pytest.raises(UploadTooLargeError):
+        asyncio.run(read_multipart_file(CONTENT_TYPE, endless(), "file", 1024))
+    assert len(consumed) < 10
+
+
+def test_rejects_truncated_upload():
+    truncated = f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.m4a\"\r\n\r\nhello".encode()
+    with pytest.raises(InvalidUploadError):
+        _read(truncated)
+
+
+def test_rejects_malformed_body():
+    with pytest.raises(InvalidUploadError):
+        _read(b"garbage")
+
+
+def test_rejects_missing_file_field():
+    with pytest.raises(InvalidUploadError):
+        _read(_body(_part("note", b"memo")))
+
+
+def test_rejects_non_multipart_content_type():
+    with pytest.raises(InvalidUploadError):
+        asyncio.run(read_multipart_file("application/json", _chunks(b"{}"), "file", 1024))
+
+
+def test_validate_filename_runs_before_file_data():
+    def reject(filename: str) -> None:
+        raise ValueError(filename)
+
+    with pytest.raises(ValueError, match="voice.txt"):
+        _read(_body(_part("file", b"data", "voice.txt")), validate_filename=reject)
+
+
+def test_reads_multiple_files_in_order():
+    body = _body(_part("images", b"one", "a.jpg"), _part("note", b"memo"), _part("images", b"two", "b.png"))
+    assert _read_many(body) == [("a.jpg", b"one"), ("b.png", b"two")]
+
+
+def test_rejects_one_oversized_file_among_many():
+    body = _body(_part("images", b"x" * 10, "a.jpg"), _part("images", b"x" * 2048, "b.jpg"))
+    with pytest.raises(UploadTooLargeError, match="파일 크기"):
+        _read_many(body)
+
+
+def test_rejects_files_over_total_limit():
+    body = _body(*(_part("images", b"x" * 1000, f"{index}.jpg") for index in range(3)))
+    with pytest.raises(UploadTooLargeError, match="전체 크기"):
+        _read_many(body, max_total_bytes=2500)
+
+
+def test_rejects_too_many_files():
+    body = _body(*(_part("images", b"x", f"{index}.jpg") for index in range(4)))
+    with pytest.raises(InvalidUploadError, match="최대 3개"):
+        _read_many(body)
+
+
+def test_spooled_upload_spills_to_disk_above_threshold():
+    small, large = b"s" * 100, b"l" * 3000
+    body = _body(_part("file", small, "a.jpg"))
+    filename, spooled = _read(body, spool_max_size=1024)
+    assert filename == "a.jpg" and spooled.read() == small and not spooled._rolled
+    spooled.close()
+
+    filename, spooled = _read(_body(_part("file", large, "b.jpg")), max_bytes=4096, spool_max_size=1024)
+    assert spooled.read() == large and spooled._rolled
+    spooled.close()